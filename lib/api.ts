@@ -37,6 +37,44 @@ class ApiClient {
     return response.json()
   }
 
+  async searchResumes(query: string) {
+    const response = await fetch(`${API_BASE_URL}/resume/search?q=${encodeURIComponent(query)}`, {
+      headers: this.getAuthHeaders(),
+    })
+
+    if (!response.ok) {
+      throw new Error("Failed to search resumes")
+    }
+
+    return response.json()
+  }
+
+  async matchResumes(jobDescription: string) {
+    const response = await fetch(`${API_BASE_URL}/resume/match`, {
+      method: "POST",
+      headers: this.getAuthHeaders(),
+      body: JSON.stringify({ job_description: jobDescription }),
+    })
+
+    if (!response.ok) {
+      throw new Error("Failed to match resumes")
+    }
+
+    return response.json()
+  }
+
+  async getResume(resumeId: string) {
+    const response = await fetch(`${API_BASE_URL}/resume/${resumeId}`, {
+      headers: this.getAuthHeaders(),
+    })
+
+    if (!response.ok) {
+      throw new Error("Failed to fetch resume")
+    }
+
+    return response.json()
+  }
+
   async createResume(resumeData: any) {
     const response = await fetch(`${API_BASE_URL}/resume`, {
       method: "POST",
@@ -65,6 +103,31 @@ class ApiClient {
     return response.json()
   }
 
+  async getResumeRevisions(resumeId: string) {
+    const response = await fetch(`${API_BASE_URL}/resume/${resumeId}/revisions`, {
+      headers: this.getAuthHeaders(),
+    })
+
+    if (!response.ok) {
+      throw new Error("Failed to fetch resume revisions")
+    }
+
+    return response.json()
+  }
+
+  async restoreResumeRevision(resumeId: string, revision: number) {
+    const response = await fetch(`${API_BASE_URL}/resume/${resumeId}/revisions/${revision}/restore`, {
+      method: "POST",
+      headers: this.getAuthHeaders(),
+    })
+
+    if (!response.ok) {
+      throw new Error("Failed to restore resume revision")
+    }
+
+    return response.json()
+  }
+
   async deleteResume(resumeId: string) {
     const response = await fetch(`${API_BASE_URL}/resume/${resumeId}`, {
       method: "DELETE",
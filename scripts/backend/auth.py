@@ -1,18 +1,16 @@
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import HTTPException, status
 from .models import TokenData
 from .database import db
+from .password_hashing import password_hasher, pwd_context
 
 # Security configuration
 SECRET_KEY = "your-secret-key-here-change-in-production-use-env-var"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -51,19 +49,19 @@ def verify_token(token: str) -> TokenData:
     except JWTError:
         raise credentials_exception
 
-def authenticate_user(email: str, password: str) -> Optional[dict]:
+async def authenticate_user(email: str, password: str) -> Optional[dict]:
     """Authenticate user with email and password"""
-    user = db.get_user_by_email(email)
+    user = await db.get_user_by_email(email)
     if not user:
         return None
-    if not verify_password(password, user["hashed_password"]):
+    if not await password_hasher.verify(password, user["hashed_password"]):
         return None
     return user
 
-def get_current_user_from_token(token: str) -> dict:
+async def get_current_user_from_token(token: str) -> dict:
     """Get current user from JWT token"""
     token_data = verify_token(token)
-    user = db.get_user_by_email(token_data.email)
+    user = await db.get_user_by_email(token_data.email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,91 @@
+"""
+Bulk PDF export: renders many resumes in parallel on the render service
+and streams them back as a ZIP archive while rendering is still going on.
+"""
+
+import asyncio
+import os
+import zipfile
+from typing import AsyncIterator, List, Tuple
+
+from pdf_cache import PDF_STREAM_CHUNK_SIZE
+from pdf_generator import pdf_filename
+from render_service import PDF_RENDER_WORKERS, RenderQueueFull, render_service
+
+# Maximum resumes per export and how many of them one export renders at a time
+EXPORT_MAX_RESUMES = int(os.getenv("EXPORT_MAX_RESUMES", 500))
+EXPORT_CONCURRENCY = int(os.getenv("EXPORT_CONCURRENCY", PDF_RENDER_WORKERS))
+
+# Pause before retrying a render the shared queue had no room for
+EXPORT_RETRY_DELAY = float(os.getenv("EXPORT_RETRY_DELAY", 0.5))
+
+class ZipStream:
+    """Write-only, unseekable file object collecting ZIP output until it is drained"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def export_entry_name(resume: dict) -> str:
+    # The id suffix keeps entries unique when several resumes share a title
+    filename = pdf_filename(resume["title"])
+    return f"{filename[:-len('.pdf')]}_{resume['id'][:8]}.pdf"
+
+async def _render(resume: dict, semaphore: asyncio.Semaphore):
+    # Returns (resume, (file, size), None) on success and (resume, None, error) on failure
+    async with semaphore:
+        while True:
+            try:
+                return resume, await render_service.render_cached(resume), None
+            except RenderQueueFull:
+                # Exports yield to interactive downloads instead of failing
+                await asyncio.sleep(EXPORT_RETRY_DELAY)
+            except Exception as e:
+                return resume, None, str(e) or type(e).__name__
+
+async def stream_resume_zip(resumes: List[dict], errors: List[Tuple[str, str]]) -> AsyncIterator[bytes]:
+    """Yield a ZIP archive of the resumes' PDFs, adding each entry as soon as its render finishes"""
+    semaphore = asyncio.Semaphore(max(1, EXPORT_CONCURRENCY))
+    tasks = [asyncio.ensure_future(_render(resume, semaphore)) for resume in resumes]
+    stream = ZipStream()
+
+    try:
+        # PDFs are already compressed, so entries are stored as-is
+        with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for next_render in asyncio.as_completed(tasks):
+                resume, rendered, error = await next_render
+                if error is not None:
+                    errors.append((resume["id"], error))
+                    continue
+
+                pdf_file, _ = rendered
+                with pdf_file, archive.open(export_entry_name(resume), mode="w") as entry:
+                    while True:
+                        chunk = pdf_file.read(PDF_STREAM_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        entry.write(chunk)
+                        yield stream.drain()
+
+            if errors:
+                report = "\n".join(f"{resume_id}: {message}" for resume_id, message in errors)
+                archive.writestr("errors.txt", report + "\n")
+        yield stream.drain()
+    finally:
+        # The client may disconnect mid-export: stop pending renders and close finished ones
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.result()[1] is not None:
+                task.result()[1][0].close()
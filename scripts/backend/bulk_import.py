@@ -0,0 +1,109 @@
+"""
+Streaming bulk import of resumes from JSON Lines (one resume per line).
+Input is consumed chunk by chunk, each record is validated on its own and
+valid ones are written in batches through the storage backend, so memory
+stays constant whatever the input size. A bad line is reported with its
+line number and skipped; it never aborts the rest of the load.
+"""
+
+import os
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+import orjson
+from pydantic import ValidationError
+
+# Resumes written per storage round trip
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 200))
+
+# Longer lines are rejected without being buffered
+IMPORT_MAX_LINE_BYTES = int(os.getenv("IMPORT_MAX_LINE_BYTES", 1024 * 1024))
+
+# Errors listed in the report; later ones are only counted
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", 100))
+
+class ImportReport:
+    def __init__(self, max_errors: int = IMPORT_MAX_REPORTED_ERRORS):
+        self.max_errors = max_errors
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def add_error(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": error})
+
+    def as_dict(self) -> dict:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = IMPORT_MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Split a byte stream into numbered lines; an overlong line comes out as None"""
+    buffer = b""
+    line_number = 0
+    overflowed = False
+    async for chunk in chunks:
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            line_number += 1
+            yield line_number, None if overflowed or len(line) > max_line_bytes else line
+            overflowed = False
+        # Drop the head of an overlong line as it arrives instead of buffering all of it
+        if len(buffer) > max_line_bytes:
+            buffer = b""
+            overflowed = True
+    if buffer or overflowed:
+        yield line_number + 1, None if overflowed or len(buffer) > max_line_bytes else buffer
+
+def describe_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+async def import_resume_lines(
+    chunks: AsyncIterator[bytes],
+    build_resume: Callable[[dict], dict],
+    storage,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    """Validate NDJSON resume records with `build_resume` and store the valid ones in batches"""
+    report = ImportReport()
+    batch = []
+    async for line_number, line in iter_lines(chunks):
+        if line is None:
+            report.add_error(line_number, f"Line is longer than {IMPORT_MAX_LINE_BYTES} bytes")
+            continue
+        if not line.strip():
+            continue
+
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            report.add_error(line_number, "Invalid JSON")
+            continue
+        if not isinstance(record, dict):
+            report.add_error(line_number, "Expected a JSON object")
+            continue
+
+        try:
+            batch.append(build_resume(record))
+        except ValidationError as e:
+            report.add_error(line_number, describe_validation_error(e))
+            continue
+
+        if len(batch) >= batch_size:
+            await storage.create_resumes(batch)
+            report.imported += len(batch)
+            batch = []
+
+    if batch:
+        await storage.create_resumes(batch)
+        report.imported += len(batch)
+    return report
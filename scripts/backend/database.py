@@ -1,141 +1,524 @@
-import redis
-import json
-from typing import Optional, List
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from redis import asyncio as redis
+from redis.exceptions import WatchError
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
+import copy
 import os
+import serialization
+from serialization import RAW_REPLY, read_record, read_records
+from resume_store import (
+    build_summary,
+    decode_cursor,
+    encode_cursor,
+    fetch_resumes,
+    index_resume,
+    load_index_page,
+    load_resumes,
+    load_summaries,
+    resume_summary_key,
+    unindex_resume,
+    updated_at_score,
+)
+from resume_history import record_revision, resume_history_key
+from search_index import (
+    ensure_search_index,
+    queue_index_terms,
+    queue_unindex_terms,
+    rank_matches,
+    read_postings,
+    resume_terms,
+    search_terms_key,
+)
 
-class RedisDatabase:
+# Redis connection settings
+REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
+REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
+REDIS_DB = int(os.getenv('REDIS_DB', 0))
+
+# Connection pool sizing: requests wait up to REDIS_POOL_TIMEOUT seconds for a free connection
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
+REDIS_POOL_TIMEOUT = float(os.getenv('REDIS_POOL_TIMEOUT', 5))
+
+# Storage backend used by the API: "redis" or "memory" (process-local, for development and tests)
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'redis')
+
+# Attempts at a resume write before giving up when concurrent writes keep invalidating it
+RESUME_WRITE_MAX_RETRIES = int(os.getenv('RESUME_WRITE_MAX_RETRIES', 5))
+
+async def create_redis_client(max_connections: int = None) -> Optional[redis.Redis]:
+    """Create an async Redis client on an explicitly sized connection pool, or None if Redis is unreachable"""
+    pool = redis.BlockingConnectionPool(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=REDIS_DB,
+        decode_responses=True,
+        max_connections=max_connections or REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+    )
+    client = redis.Redis(connection_pool=pool)
+    try:
+        await client.ping()
+        print("✅ Connected to Redis successfully")
+        return client
+    except redis.ConnectionError:
+        print("❌ Failed to connect to Redis")
+        await close_redis_client(client)
+        return None
+
+async def close_redis_client(client: Optional[redis.Redis]):
+    """Close a client created by create_redis_client together with its pool"""
+    if client is not None:
+        await client.aclose()
+        await client.connection_pool.disconnect()
+
+class StorageUnavailable(Exception):
+    """Raised when the storage backend is not connected"""
+
+class ConcurrentModification(Exception):
+    """Raised when concurrent writes keep invalidating a resume update"""
+
+class Storage(ABC):
+    """Storage interface used by every API handler and script"""
+    
+    # Redis client for the Redis-only features (render jobs); None for other backends
+    client = None
+    
+    @abstractmethod
+    async def connect(self, max_connections: int = None) -> bool: ...
+    
+    @abstractmethod
+    async def close(self): ...
+    
+    @abstractmethod
+    async def is_connected(self) -> bool: ...
+    
+    # User operations
+    @abstractmethod
+    async def get_users(self, emails: List[str]) -> List[Optional[dict]]:
+        """Load several users in one round trip, with None for unknown emails"""
+    
+    @abstractmethod
+    async def save_users(self, users: List[dict]):
+        """Create or replace several users in one round trip"""
+    
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
+        return (await self.get_users([email]))[0]
+    
+    async def create_user(self, user_data: dict) -> dict:
+        await self.save_users([user_data])
+        return user_data
+    
+    async def update_user(self, email: str, user_data: dict) -> dict:
+        await self.save_users([user_data])
+        return user_data
+    
+    # Resume operations
+    @abstractmethod
+    async def get_resumes(self, resume_ids: Iterable[str]) -> Tuple[List[dict], List[str]]:
+        """Load several resumes in one round trip, returning (resumes, missing_ids)"""
+    
+    @abstractmethod
+    async def create_resumes(self, resumes: List[dict]):
+        """Store several new resumes and index them in one round trip"""
+    
+    @abstractmethod
+    async def modify_resume(self, resume_id: str, user_id: str, mutate: Callable[[dict], dict]) -> Optional[dict]:
+        """Atomically apply `mutate` to a user's resume and bump its revision; None if not found"""
+    
+    @abstractmethod
+    async def delete_resume(self, resume_id: str, user_id: str, check: Callable[[dict], None] = None) -> bool:
+        """Atomically delete a user's resume after `check` accepted it; False if not found"""
+    
+    @abstractmethod
+    async def get_resume_history(self, resume_id: str, user_id: str) -> Optional[Tuple[dict, Dict[str, dict]]]:
+        """A user's resume and its decoded history entries by field; None if not found"""
+    
+    @abstractmethod
+    async def get_resume_revision(self, resume_id: str, user_id: str) -> Optional[int]:
+        """Revision of a user's resume without loading the document; None when unknown"""
+    
+    @abstractmethod
+    async def load_index_page(
+        self, user_id: str, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[str, float]], Optional[str]]:
+        """One page of a user's resumes, newest first, as ([(resume_id, score)], next_cursor)"""
+    
+    @abstractmethod
+    async def load_resumes(self, user_id: str, resume_ids: List[str]) -> List[dict]:
+        """Documents of an index page, in page order"""
+    
+    @abstractmethod
+    async def load_summaries(self, user_id: str, resume_ids: List[str]) -> List[dict]:
+        """Listing summaries of an index page, in page order"""
+    
+    @abstractmethod
+    async def search_resumes(self, user_id: str, terms: List[str], limit: int) -> List[Tuple[str, float, List[str]]]:
+        """Best matches of a user's resumes for query terms, as [(resume_id, score, matched_terms)]"""
+    
+    async def get_resume_by_id(self, resume_id: str) -> Optional[dict]:
+        resumes, _ = await self.get_resumes([resume_id])
+        return resumes[0] if resumes else None
+    
+    async def create_resume(self, resume_data: dict) -> dict:
+        await self.create_resumes([resume_data])
+        return resume_data
+    
+    async def update_resume(self, resume_id: str, resume_data: dict) -> Optional[dict]:
+        return await self.modify_resume(resume_id, resume_data['user_id'], lambda resume: {**resume, **resume_data})
+    
+    async def get_user_resume_ids(self, user_id: str) -> List[str]:
+        entries, _ = await self.load_index_page(user_id)
+        return [resume_id for resume_id, _ in entries]
+    
+    async def get_user_resumes(self, user_id: str) -> List[dict]:
+        return await self.load_resumes(user_id, await self.get_user_resume_ids(user_id))
+    
+    # Utility methods
+    @abstractmethod
+    async def get_all_users(self) -> List[str]: ...
+    
+    @abstractmethod
+    async def get_all_resumes(self) -> List[str]: ...
+    
+    @abstractmethod
+    async def clear_all_data(self):
+        """WARNING: This will delete all stored data"""
+
+def _queue_history(pipe, resume: dict, previous: dict, history_fields: Iterable):
+    """Queue the history writes recording the revision a write replaced"""
+    entries, drops = record_revision(resume, previous, history_fields)
+    if drops:
+        pipe.hdel(resume_history_key(resume['id']), *drops)
+    if entries:
+        pipe.hset(
+            resume_history_key(resume['id']),
+            mapping={field: serialization.dumps(entry) for field, entry in entries.items()},
+        )
+
+def _new_revision(resume: dict) -> dict:
+    resume['revision'] = resume.get('revision', 0) + 1
+    resume['updated_at'] = datetime.utcnow().isoformat()
+    return resume
+
+class RedisStorage(Storage):
     def __init__(self):
-        # Try to connect to Redis
+        # The client is created by connect() so the pool lives on the running event loop
+        self.client = None
+    
+    async def connect(self, max_connections: int = None) -> bool:
+        if self.client is None:
+            self.client = await create_redis_client(max_connections)
+        return self.client is not None
+    
+    async def close(self):
+        await close_redis_client(self.client)
+        self.client = None
+    
+    async def is_connected(self) -> bool:
+        if self.client is None:
+            return False
         try:
-            self.client = redis.Redis(
-                host=os.getenv('REDIS_HOST', 'localhost'),
-                port=int(os.getenv('REDIS_PORT', 6379)),
-                db=0,
-                decode_responses=True
-            )
-            self.client.ping()
-            print("✅ Connected to Redis successfully")
+            return await self.client.ping()
         except redis.ConnectionError:
-            print("❌ Failed to connect to Redis")
-            self.client = None
+            return False
     
-    def is_connected(self) -> bool:
-        return self.client is not None and self.client.ping()
+    def _require_client(self) -> redis.Redis:
+        if self.client is None:
+            raise StorageUnavailable("Database connection failed")
+        return self.client
     
     # User operations
-    def create_user(self, user_data: dict) -> dict:
-        if not self.client:
-            raise Exception("Database connection failed")
-        
-        user_key = f"user:{user_data['email']}"
-        self.client.set(user_key, json.dumps(user_data))
+    async def get_users(self, emails: List[str]) -> List[Optional[dict]]:
+        return await read_records(self._require_client(), [f"user:{email}" for email in emails])
+    
+    async def save_users(self, users: List[dict]):
+        pipe = self._require_client().pipeline()
+        for user_data in users:
+            pipe.set(f"user:{user_data['email']}", serialization.dumps(user_data))
+            pipe.sadd("users:index", user_data['email'])
+        await pipe.execute()
+    
+    # Resume operations
+    async def get_resumes(self, resume_ids: Iterable[str]) -> Tuple[List[dict], List[str]]:
+        return await fetch_resumes(self._require_client(), resume_ids)
+    
+    async def create_resumes(self, resumes: List[dict]):
+        pipe = self._require_client().pipeline()
+        for resume_data in resumes:
+            resume_data.setdefault('revision', 1)
+            pipe.set(f"resume:{resume_data['id']}", serialization.dumps(resume_data))
+            
+            # Add to user's resume list, listing index and the global resumes index
+            pipe.sadd(f"user_resumes:{resume_data['user_id']}", resume_data['id'])
+            index_resume(pipe, resume_data)
+            pipe.sadd("resumes:index", resume_data['id'])
+            queue_index_terms(pipe, resume_data['user_id'], resume_data['id'], resume_terms(resume_data))
+        await pipe.execute()
+    
+    async def modify_resume(self, resume_id: str, user_id: str, mutate: Callable[[dict], dict]) -> Optional[dict]:
+        resume_key = f"resume:{resume_id}"
         
-        # Add to users index
-        self.client.sadd("users:index", user_data['email'])
+        # Optimistic transaction: a concurrent write to the resume aborts EXEC and the change is re-applied
+        for _ in range(RESUME_WRITE_MAX_RETRIES):
+            async with self._require_client().pipeline() as pipe:
+                try:
+                    await pipe.watch(resume_key, search_terms_key(resume_id), resume_history_key(resume_id))
+                    resume = await read_record(pipe, resume_key)
+                    if not resume or resume['user_id'] != user_id:
+                        return None
+                    previous = copy.deepcopy(resume)
+                    resume = _new_revision(mutate(resume))
+                    old_terms = await pipe.smembers(search_terms_key(resume_id))
+                    history_fields = await pipe.hkeys(resume_history_key(resume_id))
+                    
+                    # Save updated resume, move it to the top of the listing index, re-index its terms and record the revision
+                    pipe.multi()
+                    pipe.set(resume_key, serialization.dumps(resume))
+                    index_resume(pipe, resume)
+                    queue_index_terms(pipe, user_id, resume_id, resume_terms(resume), old_terms)
+                    _queue_history(pipe, resume, previous, history_fields)
+                    await pipe.execute()
+                    return resume
+                except WatchError:
+                    continue
+        raise ConcurrentModification()
+    
+    async def delete_resume(self, resume_id: str, user_id: str, check: Callable[[dict], None] = None) -> bool:
+        resume_key = f"resume:{resume_id}"
         
-        return user_data
+        for _ in range(RESUME_WRITE_MAX_RETRIES):
+            async with self._require_client().pipeline() as pipe:
+                try:
+                    await pipe.watch(resume_key, search_terms_key(resume_id))
+                    resume = await read_record(pipe, resume_key)
+                    if not resume or resume['user_id'] != user_id:
+                        return False
+                    if check is not None:
+                        check(resume)
+                    old_terms = await pipe.smembers(search_terms_key(resume_id))
+                    
+                    # Remove the document, the user's resume list entry and every index
+                    pipe.multi()
+                    pipe.delete(resume_key)
+                    pipe.srem(f"user_resumes:{user_id}", resume_id)
+                    unindex_resume(pipe, user_id, resume_id)
+                    pipe.srem("resumes:index", resume_id)
+                    queue_unindex_terms(pipe, user_id, resume_id, old_terms)
+                    pipe.delete(resume_history_key(resume_id))
+                    await pipe.execute()
+                    return True
+                except WatchError:
+                    continue
+        raise ConcurrentModification()
     
-    def get_user_by_email(self, email: str) -> Optional[dict]:
-        if not self.client:
+    async def get_resume_history(self, resume_id: str, user_id: str) -> Optional[Tuple[dict, Dict[str, dict]]]:
+        pipe = self._require_client().pipeline(transaction=False)
+        pipe.execute_command("GET", f"resume:{resume_id}", **RAW_REPLY)
+        pipe.execute_command("HGETALL", resume_history_key(resume_id), **RAW_REPLY)
+        resume_data, history = await pipe.execute()
+        if resume_data is None:
             return None
-        
-        user_data = self.client.get(f"user:{email}")
-        if user_data:
-            return json.loads(user_data)
-        return None
+        resume = serialization.loads(resume_data)
+        if resume['user_id'] != user_id:
+            return None
+        return resume, {field.decode('utf-8'): serialization.loads(entry) for field, entry in (history or {}).items()}
     
-    def update_user(self, email: str, user_data: dict) -> dict:
-        if not self.client:
-            raise Exception("Database connection failed")
-        
-        user_key = f"user:{email}"
-        self.client.set(user_key, json.dumps(user_data))
-        return user_data
+    async def get_resume_revision(self, resume_id: str, user_id: str) -> Optional[int]:
+        owner_id, revision = await self._require_client().hmget(resume_summary_key(resume_id), "user_id", "revision")
+        if owner_id != user_id or revision is None:
+            return None
+        return int(revision)
+    
+    async def load_index_page(self, user_id: str, limit: Optional[int] = None, cursor: Optional[str] = None):
+        return await load_index_page(self._require_client(), user_id, limit=limit, cursor=cursor)
+    
+    async def load_resumes(self, user_id: str, resume_ids: List[str]) -> List[dict]:
+        return await load_resumes(self._require_client(), user_id, resume_ids)
+    
+    async def load_summaries(self, user_id: str, resume_ids: List[str]) -> List[dict]:
+        return await load_summaries(self._require_client(), user_id, resume_ids)
+    
+    async def search_resumes(self, user_id: str, terms: List[str], limit: int) -> List[Tuple[str, float, List[str]]]:
+        client = self._require_client()
+        await ensure_search_index(client, user_id)
+        return rank_matches(terms, await read_postings(client, user_id, terms), limit)
+    
+    # Utility methods
+    async def get_all_users(self) -> List[str]:
+        return list(await self._require_client().smembers("users:index"))
+    
+    async def get_all_resumes(self) -> List[str]:
+        return list(await self._require_client().smembers("resumes:index"))
+    
+    async def clear_all_data(self):
+        """WARNING: This will delete all data in the Redis database"""
+        await self._require_client().flushdb()
+        print("🗑️  All data cleared from Redis")
+
+class MemoryStorage(Storage):
+    """Process-local backend; documents go through the same serializer as in Redis"""
+    
+    def __init__(self):
+        self._connected = False
+        self._users: Dict[str, bytes] = {}
+        self._resumes: Dict[str, bytes] = {}
+        # user_id -> {resume_id: updated_at score}, the equivalent of the Redis sorted index
+        self._index: Dict[str, Dict[str, float]] = defaultdict(dict)
+        # user_id -> term -> {resume_id: weight}, and the terms each resume is indexed under
+        self._postings: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(lambda: defaultdict(dict))
+        self._terms: Dict[str, Dict[str, float]] = {}
+        # resume_id -> {history field: serialized entry}
+        self._history: Dict[str, Dict[str, bytes]] = defaultdict(dict)
+    
+    async def connect(self, max_connections: int = None) -> bool:
+        self._connected = True
+        return True
+    
+    async def close(self):
+        self._connected = False
+    
+    async def is_connected(self) -> bool:
+        return self._connected
+    
+    def _load(self, store: Dict[str, bytes], key: str) -> Optional[dict]:
+        data = store.get(key)
+        return serialization.loads(data) if data is not None else None
+    
+    # User operations
+    async def get_users(self, emails: List[str]) -> List[Optional[dict]]:
+        return [self._load(self._users, email) for email in emails]
+    
+    async def save_users(self, users: List[dict]):
+        for user_data in users:
+            self._users[user_data['email']] = serialization.dumps(user_data)
     
     # Resume operations
-    def create_resume(self, resume_data: dict) -> dict:
-        if not self.client:
-            raise Exception("Database connection failed")
-        
-        resume_key = f"resume:{resume_data['id']}"
-        self.client.set(resume_key, json.dumps(resume_data))
-        
-        # Add to user's resume list
-        user_resumes_key = f"user_resumes:{resume_data['user_id']}"
-        self.client.sadd(user_resumes_key, resume_data['id'])
-        
-        # Add to global resumes index
-        self.client.sadd("resumes:index", resume_data['id'])
-        
-        return resume_data
+    def _index_terms(self, resume: dict):
+        postings = self._postings[resume['user_id']]
+        terms = resume_terms(resume)
+        for term in set(self._terms.get(resume['id'], ())) - set(terms):
+            postings[term].pop(resume['id'], None)
+        for term, weight in terms.items():
+            postings[term][resume['id']] = weight
+        self._terms[resume['id']] = terms
     
-    def get_resume_by_id(self, resume_id: str) -> Optional[dict]:
-        if not self.client:
-            return None
-        
-        resume_data = self.client.get(f"resume:{resume_id}")
-        if resume_data:
-            return json.loads(resume_data)
-        return None
+    def _record_history(self, resume: dict, previous: dict):
+        history = self._history[resume['id']]
+        entries, drops = record_revision(resume, previous, list(history))
+        for field in drops:
+            del history[field]
+        for field, entry in entries.items():
+            history[field] = serialization.dumps(entry)
     
-    def get_user_resumes(self, user_id: str) -> List[dict]:
-        if not self.client:
-            return []
-        
-        user_resumes_key = f"user_resumes:{user_id}"
-        resume_ids = self.client.smembers(user_resumes_key)
-        
+    async def get_resumes(self, resume_ids: Iterable[str]) -> Tuple[List[dict], List[str]]:
         resumes = []
+        missing = []
         for resume_id in resume_ids:
-            resume_data = self.get_resume_by_id(resume_id)
-            if resume_data:
-                resumes.append(resume_data)
-        
-        # Sort by updated_at descending
-        resumes.sort(key=lambda x: x.get('updated_at', ''), reverse=True)
-        return resumes
+            resume = self._load(self._resumes, resume_id)
+            if resume is None:
+                missing.append(resume_id)
+            else:
+                resumes.append(resume)
+        return resumes, missing
     
-    def update_resume(self, resume_id: str, resume_data: dict) -> dict:
-        if not self.client:
-            raise Exception("Database connection failed")
-        
-        resume_data['updated_at'] = datetime.utcnow().isoformat()
-        resume_key = f"resume:{resume_id}"
-        self.client.set(resume_key, json.dumps(resume_data))
-        return resume_data
+    async def create_resumes(self, resumes: List[dict]):
+        for resume_data in resumes:
+            resume_data.setdefault('revision', 1)
+            self._resumes[resume_data['id']] = serialization.dumps(resume_data)
+            self._index[resume_data['user_id']][resume_data['id']] = updated_at_score(resume_data)
+            self._index_terms(resume_data)
     
-    def delete_resume(self, resume_id: str, user_id: str) -> bool:
-        if not self.client:
+    # No awaits between the read and the write, so these are atomic on the event loop
+    async def modify_resume(self, resume_id: str, user_id: str, mutate: Callable[[dict], dict]) -> Optional[dict]:
+        resume = self._load(self._resumes, resume_id)
+        if not resume or resume['user_id'] != user_id:
+            return None
+        previous = copy.deepcopy(resume)
+        resume = _new_revision(mutate(resume))
+        self._resumes[resume_id] = serialization.dumps(resume)
+        self._index[user_id][resume_id] = updated_at_score(resume)
+        self._index_terms(resume)
+        self._record_history(resume, previous)
+        return resume
+    
+    async def delete_resume(self, resume_id: str, user_id: str, check: Callable[[dict], None] = None) -> bool:
+        resume = self._load(self._resumes, resume_id)
+        if not resume or resume['user_id'] != user_id:
             return False
+        if check is not None:
+            check(resume)
+        del self._resumes[resume_id]
+        self._index[user_id].pop(resume_id, None)
+        for term in self._terms.pop(resume_id, {}):
+            self._postings[user_id][term].pop(resume_id, None)
+        self._history.pop(resume_id, None)
+        return True
+    
+    async def get_resume_history(self, resume_id: str, user_id: str) -> Optional[Tuple[dict, Dict[str, dict]]]:
+        resume = self._load(self._resumes, resume_id)
+        if not resume or resume['user_id'] != user_id:
+            return None
+        return resume, {field: serialization.loads(entry) for field, entry in self._history.get(resume_id, {}).items()}
+    
+    async def get_resume_revision(self, resume_id: str, user_id: str) -> Optional[int]:
+        resume = self._load(self._resumes, resume_id)
+        if not resume or resume['user_id'] != user_id:
+            return None
+        return resume.get('revision', 0)
+    
+    async def load_index_page(self, user_id: str, limit: Optional[int] = None, cursor: Optional[str] = None):
+        # Same order as ZREVRANGE: newest first, ties in reverse lexical order
+        entries = sorted(self._index[user_id].items(), key=lambda entry: (entry[1], entry[0]), reverse=True)
+        if cursor is not None:
+            score, last_id = decode_cursor(cursor)
+            entries = [(member, member_score) for member, member_score in entries
+                       if member_score < score or (member_score == score and member < last_id)]
         
-        # Remove from user's resume list
-        user_resumes_key = f"user_resumes:{user_id}"
-        self.client.srem(user_resumes_key, resume_id)
-        
-        # Remove from global index
-        self.client.srem("resumes:index", resume_id)
-        
-        # Delete the resume data
-        resume_key = f"resume:{resume_id}"
-        return bool(self.client.delete(resume_key))
+        page = entries if limit is None else entries[:limit]
+        next_cursor = None
+        if limit is not None and len(entries) > limit:
+            last_member, last_score = page[-1]
+            next_cursor = encode_cursor(last_score, last_member)
+        return page, next_cursor
+    
+    async def load_resumes(self, user_id: str, resume_ids: List[str]) -> List[dict]:
+        resumes, _ = await self.get_resumes(resume_ids)
+        return resumes
+    
+    async def load_summaries(self, user_id: str, resume_ids: List[str]) -> List[dict]:
+        return [build_summary(resume) for resume in await self.load_resumes(user_id, resume_ids)]
+    
+    async def search_resumes(self, user_id: str, terms: List[str], limit: int) -> List[Tuple[str, float, List[str]]]:
+        postings = self._postings[user_id]
+        return rank_matches(terms, [postings.get(term, {}) for term in terms], limit)
     
     # Utility methods
-    def get_all_users(self) -> List[str]:
-        if not self.client:
-            return []
-        return list(self.client.smembers("users:index"))
+    async def get_all_users(self) -> List[str]:
+        return list(self._users)
     
-    def get_all_resumes(self) -> List[str]:
-        if not self.client:
-            return []
-        return list(self.client.smembers("resumes:index"))
+    async def get_all_resumes(self) -> List[str]:
+        return list(self._resumes)
     
-    def clear_all_data(self):
-        """WARNING: This will delete all data in the Redis database"""
-        if self.client:
-            self.client.flushdb()
-            print("🗑️  All data cleared from Redis")
+    async def clear_all_data(self):
+        """WARNING: This will delete all data held by this process"""
+        self._users.clear()
+        self._resumes.clear()
+        self._index.clear()
+        self._postings.clear()
+        self._terms.clear()
+        self._history.clear()
+
+STORAGE_BACKENDS = {
+    'redis': RedisStorage,
+    'memory': MemoryStorage,
+}
+
+def create_storage(backend: str = STORAGE_BACKEND) -> Storage:
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return STORAGE_BACKENDS[backend]()
 
 # Global database instance
-db = RedisDatabase()
+db = create_storage()
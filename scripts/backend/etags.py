@@ -0,0 +1,37 @@
+"""
+ETag helpers for conditional requests. A resume's ETag is its revision
+counter; listing ETags are a digest of the page's index entries, so both
+can be checked without loading or serializing the documents.
+"""
+
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+def resume_etag(revision) -> str:
+    return f'"rev-{int(revision)}"'
+
+def page_etag(entries: Iterable[Tuple[str, float]], next_cursor: Optional[str] = None) -> str:
+    """Weak ETag of a listing page from its (resume_id, updated_at score) index entries"""
+    digest = hashlib.sha1()
+    for resume_id, score in entries:
+        digest.update(f"{resume_id}:{score!r};".encode("utf-8"))
+    digest.update((next_cursor or "").encode("utf-8"))
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """Check an If-Match / If-None-Match header value against an ETag; `weak` selects weak comparison"""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak:
+            if _opaque_tag(candidate) == _opaque_tag(etag):
+                return True
+        elif candidate == etag and not etag.startswith("W/"):
+            return True
+    return False
@@ -1,20 +1,57 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, EmailStr
-from passlib.context import CryptContext
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, EmailStr, Field, ValidationError
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-import redis
+from contextlib import asynccontextmanager
+import asyncio
 import json
 import os
-from typing import Optional, List
+from typing import Literal, Optional, List
 import uuid
-from pdf_generator import generate_resume_pdf
+from pdf_cache import iter_file, pdf_cache
+from pdf_generator import pdf_filename
+from bulk_export import EXPORT_MAX_RESUMES, stream_resume_zip
+from bulk_import import import_resume_lines
+from render_service import PDF_RENDER_RETRY_AFTER, RenderQueueFull, RenderTimeout, render_service
+from render_jobs import RENDER_JOB_QUEUE_KEY, get_render_job, render_job_workers, submit_render_job
+from etags import etag_matches, page_etag, resume_etag
+from response_compression import CompressionMiddleware
+from resume_patch import PatchError, apply_resume_patch
+from search_index import query_terms
+from resume_history import list_revisions, reconstruct
+from resume_match import job_vector, resume_vector, resume_vector_cache, score_resumes
+import serialization
+from models import ResumeListItem
+from redis.exceptions import RedisError
+from password_hashing import PasswordHashQueueFull, password_hasher
+from principal_cache import principal_cache
+from database import ConcurrentModification, StorageUnavailable, create_storage, db
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Storage connects on the app's event loop; render jobs need the Redis backend
+    if not await db.connect():
+        print("❌ Make sure Redis is running.")
+    elif db.client is not None:
+        render_job_workers.start()
+    render_service.start()
+    yield
+    render_job_workers.shutdown()
+    await db.close()
+    password_hasher.shutdown()
+    render_service.shutdown()
 
 # Initialize FastAPI app
-app = FastAPI(title="ResumeBuilder Pro API", version="1.0.0")
+app = FastAPI(
+    title="ResumeBuilder Pro API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS middleware
 app.add_middleware(
@@ -23,24 +60,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Response compression for JSON and text bodies
+app.add_middleware(CompressionMiddleware)
+
 # Security
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-security = HTTPBearer()
+# When enabled, requests are authorized from the signed token claims alone
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() in ("1", "true", "yes")
 
-# Redis connection
-try:
-    redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
-    redis_client.ping()
-    print("✅ Connected to Redis successfully")
-except redis.ConnectionError:
-    print("❌ Failed to connect to Redis. Make sure Redis is running.")
-    redis_client = None
+# Upper bound for the `limit` parameter of GET /resume
+MAX_RESUME_PAGE_SIZE = int(os.getenv("MAX_RESUME_PAGE_SIZE", 100))
+
+# Number of results GET /resume/search returns when no `limit` is given
+SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", 20))
+
+security = HTTPBearer()
 
 class PersonalDetails(BaseModel):
     fullName: str
@@ -86,6 +126,62 @@ class ResumeUpdate(BaseModel):
     template: Optional[str] = None
     data: Optional[ResumeData] = None
 
+class SectionOperation(BaseModel):
+    op: Literal["upsert", "remove"]
+    section: Literal["experience", "education"]
+    id: str
+    # Fields to merge into the entry (or the full entry when it is new); unused by remove
+    item: Optional[dict] = None
+
+class ResumePatch(BaseModel):
+    title: Optional[str] = None
+    template: Optional[str] = None
+    # JSON merge-patch applied to the resume data
+    data: Optional[dict] = None
+    operations: List[SectionOperation] = []
+
+class ResumeExportRequest(BaseModel):
+    # None exports every resume of the current user
+    resume_ids: Optional[List[str]] = None
+
+class ResumeRevision(BaseModel):
+    revision: int
+    # How the revision is stored: "snapshot", "delta", or "current" for the live document
+    kind: str
+    updated_at: Optional[datetime] = None
+
+class JobMatchRequest(BaseModel):
+    job_description: str
+    # None scores every resume of the current user
+    limit: Optional[int] = Field(None, ge=1)
+
+class ResumeMatch(BaseModel):
+    id: str
+    title: str
+    revision: int
+    score: float
+    matched_keywords: List[str]
+    missing_keywords: List[str]
+
+class RenderJobRequest(BaseModel):
+    # None renders every resume of the current user
+    resume_ids: Optional[List[str]] = None
+
+class RenderJobError(BaseModel):
+    resume_id: str
+    error: str
+
+class RenderJob(BaseModel):
+    id: str
+    status: str
+    total: int
+    completed: int
+    failed: int
+    errors: List[RenderJobError]
+    artifact_url: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
 class Resume(BaseModel):
     id: str
     title: str
@@ -94,6 +190,15 @@ class Resume(BaseModel):
     created_at: datetime
     updated_at: datetime
     user_id: str
+    revision: int = 0
+
+class ResumeSearchResult(ResumeListItem):
+    score: float
+    matched_terms: List[str]
+
+# Stored resumes and summaries are validated on write, so reads serialize these fields as stored
+RESUME_RESPONSE_FIELDS = tuple(Resume.model_fields)
+SUMMARY_RESPONSE_FIELDS = tuple(ResumeListItem.model_fields)
 
 # Existing Pydantic models
 class UserCreate(BaseModel):
@@ -119,11 +224,12 @@ class TokenData(BaseModel):
     email: Optional[str] = None
 
 # Utility functions
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# bcrypt runs on a bounded worker pool so it never blocks the event loop
+async def verify_password(plain_password, hashed_password):
+    return await password_hasher.verify(plain_password, hashed_password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await password_hasher.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -135,117 +241,188 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_user_by_email(email: str):
-    if not redis_client:
-        return None
-    
-    user_data = redis_client.get(f"user:{email}")
-    if user_data:
-        return json.loads(user_data)
-    return None
+def token_claims(user: dict) -> dict:
+    # Identity claims embedded in every token so stateless mode can skip the user lookup
+    return {
+        "sub": user["email"],
+        "uid": user["id"],
+        "name": user["full_name"],
+        "created_at": user["created_at"],
+    }
 
-def create_user(user_data: dict):
-    if not redis_client:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    
-    user_key = f"user:{user_data['email']}"
-    redis_client.set(user_key, json.dumps(user_data))
+async def get_user_by_email(email: str):
+    return await db.get_user_by_email(email)
+
+async def create_user(user_data: dict):
+    await db.create_user(user_data)
+    principal_cache.invalidate(user_data["email"])
     return user_data
 
-def authenticate_user(email: str, password: str):
-    user = get_user_by_email(email)
+async def authenticate_user(email: str, password: str):
+    user = await get_user_by_email(email)
     if not user:
         return False
-    if not verify_password(password, user["hashed_password"]):
+    valid, new_hash = await password_hasher.verify_and_update(password, user["hashed_password"])
+    if not valid:
         return False
+    
+    # Re-hash with the configured cost factor when the stored hash is outdated
+    if new_hash:
+        user["hashed_password"] = new_hash
+        await create_user(user)
     return user
 
-def create_resume_in_db(resume_data: dict, user_id: str):
-    if not redis_client:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    
-    resume_id = str(uuid.uuid4())
-    resume_data["id"] = resume_id
+def new_resume_record(resume_data: dict, user_id: str) -> dict:
+    resume_data["id"] = str(uuid.uuid4())
     resume_data["user_id"] = user_id
     resume_data["created_at"] = datetime.utcnow().isoformat()
     resume_data["updated_at"] = datetime.utcnow().isoformat()
-    
-    # Store resume
-    resume_key = f"resume:{resume_id}"
-    redis_client.set(resume_key, json.dumps(resume_data))
-    
-    # Add to user's resume list
-    user_resumes_key = f"user_resumes:{user_id}"
-    redis_client.sadd(user_resumes_key, resume_id)
-    
+    resume_data["revision"] = 1
     return resume_data
 
-def get_user_resumes(user_id: str):
-    if not redis_client:
-        return []
-    
-    user_resumes_key = f"user_resumes:{user_id}"
-    resume_ids = redis_client.smembers(user_resumes_key)
-    
-    resumes = []
-    for resume_id in resume_ids:
-        resume_data = redis_client.get(f"resume:{resume_id}")
-        if resume_data:
-            resumes.append(json.loads(resume_data))
-    
-    # Sort by updated_at descending
-    resumes.sort(key=lambda x: x["updated_at"], reverse=True)
-    return resumes
+def build_imported_resume(record: dict, user_id: str) -> dict:
+    """Validate one bulk import record like POST /resume does and turn it into a new stored resume"""
+    resume = ResumeCreate(**record)
+    return new_resume_record(
+        {"title": resume.title, "template": resume.template, "data": resume.data.dict()},
+        user_id
+    )
 
-def get_resume_by_id(resume_id: str, user_id: str):
-    if not redis_client:
-        return None
-    
-    resume_data = redis_client.get(f"resume:{resume_id}")
-    if resume_data:
-        resume = json.loads(resume_data)
-        if resume["user_id"] == user_id:
-            return resume
+async def create_resume_in_db(resume_data: dict, user_id: str):
+    return await db.create_resume(new_resume_record(resume_data, user_id))
+
+def resume_payload(resume: dict) -> dict:
+    """Project a stored resume onto the Resume response fields without re-validating it"""
+    payload = {field: resume.get(field) for field in RESUME_RESPONSE_FIELDS}
+    payload["revision"] = resume.get("revision", 0)
+    return payload
+
+def summary_payload(summary: dict) -> dict:
+    """Project a stored summary hash onto the ResumeListItem response fields"""
+    payload = {field: summary.get(field) for field in SUMMARY_RESPONSE_FIELDS}
+    payload["revision"] = int(summary.get("revision", 0))
+    return payload
+
+def render_job_response(job: dict) -> RenderJob:
+    return RenderJob(
+        id=job["id"],
+        status=job["status"],
+        total=int(job["total"]),
+        completed=int(job["completed"]),
+        failed=int(job["failed"]),
+        errors=[RenderJobError(resume_id=resume_id, error=error) for resume_id, error in json.loads(job["errors"])],
+        artifact_url=f"/render-jobs/{job['id']}/artifact" if job["status"] == "completed" else None,
+        created_at=datetime.fromisoformat(job["created_at"]),
+        updated_at=datetime.fromisoformat(job["updated_at"])
+    )
+
+async def get_resumes_by_ids(resume_ids: List[str], user_id: str):
+    resumes, _ = await db.get_resumes(resume_ids)
+    return [resume for resume in resumes if resume["user_id"] == user_id]
+
+async def get_resume_by_id(resume_id: str, user_id: str):
+    resume = await db.get_resume_by_id(resume_id)
+    if resume and resume["user_id"] == user_id:
+        return resume
     return None
 
-def update_resume_in_db(resume_id: str, update_data: dict, user_id: str):
-    if not redis_client:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    
-    resume = get_resume_by_id(resume_id, user_id)
-    if not resume:
-        return None
-    
-    # Update fields
-    for key, value in update_data.items():
-        if value is not None:
-            resume[key] = value
+def check_if_match(if_match: Optional[str], resume: dict):
+    """Reject a write whose If-Match precondition doesn't hold for the stored revision"""
+    if if_match is None:
+        return
     
-    resume["updated_at"] = datetime.utcnow().isoformat()
-    
-    # Save updated resume
-    resume_key = f"resume:{resume_id}"
-    redis_client.set(resume_key, json.dumps(resume))
-    
-    return resume
+    etag = resume_etag(resume.get("revision", 0))
+    # Compressed responses carry the weak form of the same revision tag, so compare weakly
+    if not etag_matches(if_match, etag):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Resume has been modified",
+            headers={"ETag": etag}
+        )
 
-def delete_resume_from_db(resume_id: str, user_id: str):
-    if not redis_client:
-        raise HTTPException(status_code=500, detail="Database connection failed")
-    
-    resume = get_resume_by_id(resume_id, user_id)
-    if not resume:
-        return False
-    
-    # Remove from Redis
-    resume_key = f"resume:{resume_id}"
-    redis_client.delete(resume_key)
+async def modify_resume_in_db(resume_id: str, user_id: str, mutate, if_match: Optional[str] = None):
+    # The precondition is checked inside the storage transaction, against the revision being replaced
+    def checked_mutate(resume: dict) -> dict:
+        check_if_match(if_match, resume)
+        return mutate(resume)
+    
+    return await db.modify_resume(resume_id, user_id, checked_mutate)
+
+async def update_resume_in_db(resume_id: str, update_data: dict, user_id: str, if_match: Optional[str] = None):
+    def apply_update(resume: dict) -> dict:
+        for key, value in update_data.items():
+            if value is not None:
+                resume[key] = value
+        return resume
+    
+    return await modify_resume_in_db(resume_id, user_id, apply_update, if_match)
+
+async def patch_resume_in_db(resume_id: str, resume_patch: ResumePatch, user_id: str, if_match: Optional[str] = None):
+    operations = [operation.dict() for operation in resume_patch.operations]
+    
+    def apply_patch(resume: dict) -> dict:
+        resume = apply_resume_patch(
+            resume,
+            title=resume_patch.title,
+            template=resume_patch.template,
+            data_patch=resume_patch.data,
+            operations=operations,
+        )
+        resume["data"] = ResumeData(**resume["data"]).dict()
+        return resume
     
-    # Remove from user's resume list
-    user_resumes_key = f"user_resumes:{user_id}"
-    redis_client.srem(user_resumes_key, resume_id)
+    return await modify_resume_in_db(resume_id, user_id, apply_patch, if_match)
+
+async def delete_resume_from_db(resume_id: str, user_id: str, if_match: Optional[str] = None):
+    deleted = await db.delete_resume(resume_id, user_id, check=lambda resume: check_if_match(if_match, resume))
+    if deleted:
+        resume_vector_cache.invalidate(resume_id)
+    return deleted
+
+async def get_resume_at_revision(resume_id: str, user_id: str, revision: int):
+    """Rebuild a recorded revision of a user's resume; None when the resume or revision is unknown"""
+    found = await db.get_resume_history(resume_id, user_id)
+    if found is None:
+        return None
+    resume, history = found
+    return reconstruct(resume, history, revision)
+
+async def load_listing_page(user_id: str, limit: Optional[int], cursor: Optional[str], if_none_match: Optional[str]):
+    """Read one page of a user's resume index as (entries, headers), or a 304 response when the client's copy is current"""
+    try:
+        entries, next_cursor = await db.load_index_page(user_id, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     
-    return True
+    # The page ETag comes from the index alone, so an unchanged page is answered without loading documents
+    headers = {"ETag": page_etag(entries, next_cursor)}
+    
+    # Pass the cursor for the next page in a header so the body stays a plain list
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return entries, headers
+
+async def get_resume_vectors(user_id: str, summaries: List[dict]):
+    """Term vectors of a user's resumes, loading only the documents whose cached vector is stale"""
+    vectors = {}
+    stale = []
+    for summary in summaries:
+        vector = resume_vector_cache.get(summary["id"], int(summary.get("revision", 0)))
+        if vector is None:
+            stale.append(summary["id"])
+        else:
+            vectors[summary["id"]] = vector
+    
+    for resume in await get_resumes_by_ids(stale, user_id):
+        vectors[resume["id"]] = resume_vector(resume)
+        resume_vector_cache.set(resume["id"], resume.get("revision", 0), vectors[resume["id"]])
+    return vectors
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     credentials_exception = HTTPException(
@@ -263,10 +440,60 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise credentials_exception
     
-    user = get_user_by_email(email=token_data.email)
+    # Tokens issued before identity claims existed still go through the lookup
+    if AUTH_STATELESS and "uid" in payload:
+        return {
+            "id": payload["uid"],
+            "full_name": payload["name"],
+            "email": email,
+            "created_at": payload["created_at"],
+        }
+    
+    principal = principal_cache.get(token_data.email)
+    if principal is not None:
+        return principal
+    
+    user = await get_user_by_email(email=token_data.email)
     if user is None:
         raise credentials_exception
-    return user
+    return principal_cache.set(token_data.email, user)
+
+@app.exception_handler(PasswordHashQueueFull)
+async def password_hash_queue_full_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+@app.exception_handler(StorageUnavailable)
+async def storage_unavailable_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "Database connection failed"},
+    )
+
+@app.exception_handler(ConcurrentModification)
+async def concurrent_modification_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "Resume is being modified concurrently, please retry"},
+    )
+
+@app.exception_handler(RenderQueueFull)
+async def render_queue_full_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "PDF renderer is busy, please retry shortly"},
+        headers={"Retry-After": str(PDF_RENDER_RETRY_AFTER)},
+    )
+
+@app.exception_handler(RenderTimeout)
+async def render_timeout_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "PDF generation timed out"},
+    )
 
 # API Routes
 @app.get("/")
@@ -276,14 +503,14 @@ async def root():
 @app.post("/auth/signup", response_model=Token)
 async def signup(user: UserCreate):
     # Check if user already exists
-    if get_user_by_email(user.email):
+    if await get_user_by_email(user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     user_id = f"user_{int(datetime.utcnow().timestamp())}"
     
     user_data = {
@@ -295,19 +522,19 @@ async def signup(user: UserCreate):
         "resumes": []
     }
     
-    create_user(user_data)
+    await create_user(user_data)
     
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=token_claims(user_data), expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/auth/login", response_model=Token)
 async def login(user: UserLogin):
-    user_data = authenticate_user(user.email, user.password)
+    user_data = await authenticate_user(user.email, user.password)
     if not user_data:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -317,7 +544,7 @@ async def login(user: UserLogin):
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user_data["email"]}, expires_delta=access_token_expires
+        data=token_claims(user_data), expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
@@ -339,37 +566,167 @@ async def create_resume(resume: ResumeCreate, current_user: dict = Depends(get_c
         "data": resume.data.dict()
     }
     
-    created_resume = create_resume_in_db(resume_data, current_user["id"])
+    created_resume = await create_resume_in_db(resume_data, current_user["id"])
     
-    return Resume(
-        id=created_resume["id"],
-        title=created_resume["title"],
-        template=created_resume["template"],
-        data=ResumeData(**created_resume["data"]),
-        created_at=datetime.fromisoformat(created_resume["created_at"]),
-        updated_at=datetime.fromisoformat(created_resume["updated_at"]),
-        user_id=created_resume["user_id"]
+    # Responses are built from the stored document directly: it was validated on the way in
+    return ORJSONResponse(resume_payload(created_resume), headers={"ETag": resume_etag(created_resume["revision"])})
+
+@app.post("/resume/import")
+async def import_resumes(request: Request, current_user: dict = Depends(get_current_user)):
+    # The NDJSON body is validated and written as it streams in; bad lines are reported, not fatal
+    report = await import_resume_lines(
+        request.stream(),
+        lambda record: build_imported_resume(record, current_user["id"]),
+        db
     )
+    return report.as_dict()
 
 @app.get("/resume", response_model=List[Resume])
-async def get_resumes(current_user: dict = Depends(get_current_user)):
-    resumes = get_user_resumes(current_user["id"])
-    
-    return [
-        Resume(
-            id=resume["id"],
-            title=resume["title"],
-            template=resume["template"],
-            data=ResumeData(**resume["data"]),
-            created_at=datetime.fromisoformat(resume["created_at"]),
-            updated_at=datetime.fromisoformat(resume["updated_at"]),
-            user_id=resume["user_id"]
+async def get_resumes(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_RESUME_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    page = await load_listing_page(current_user["id"], limit, cursor, if_none_match)
+    if isinstance(page, Response):
+        return page
+    entries, headers = page
+    
+    resumes = await db.load_resumes(current_user["id"], [resume_id for resume_id, _ in entries])
+    return ORJSONResponse([resume_payload(resume) for resume in resumes], headers=headers)
+
+@app.get("/resume/summary", response_model=List[ResumeListItem])
+async def get_resume_summaries(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_RESUME_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    page = await load_listing_page(current_user["id"], limit, cursor, if_none_match)
+    if isinstance(page, Response):
+        return page
+    entries, headers = page
+    
+    summaries = await db.load_summaries(current_user["id"], [resume_id for resume_id, _ in entries])
+    return ORJSONResponse([summary_payload(summary) for summary in summaries], headers=headers)
+
+@app.get("/resume/search", response_model=List[ResumeSearchResult])
+async def search_resumes(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=MAX_RESUME_PAGE_SIZE),
+    current_user: dict = Depends(get_current_user),
+):
+    terms = query_terms(q)
+    if not terms:
+        return ORJSONResponse([])
+    
+    # Ranking only reads the caller's postings for the query terms; summaries are loaded for the hits alone
+    matches = await db.search_resumes(current_user["id"], terms, limit)
+    summaries = {
+        summary["id"]: summary
+        for summary in await db.load_summaries(current_user["id"], [resume_id for resume_id, _, _ in matches])
+    }
+    
+    results = []
+    for resume_id, score, matched_terms in matches:
+        if resume_id in summaries:
+            results.append({**summary_payload(summaries[resume_id]), "score": score, "matched_terms": matched_terms})
+    return ORJSONResponse(results)
+
+@app.post("/resume/match", response_model=List[ResumeMatch])
+async def match_resumes(match_request: JobMatchRequest, current_user: dict = Depends(get_current_user)):
+    job = job_vector(match_request.job_description)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Job description has no keywords"
         )
-        for resume in resumes
-    ]
+    
+    # Revisions come from the summaries, so unchanged resumes are scored from cached vectors
+    resume_ids = await db.get_user_resume_ids(current_user["id"])
+    summaries = {summary["id"]: summary for summary in await db.load_summaries(current_user["id"], resume_ids)}
+    vectors = await get_resume_vectors(current_user["id"], list(summaries.values()))
+    
+    results = score_resumes(job, vectors)
+    if match_request.limit is not None:
+        results = results[:match_request.limit]
+    
+    return ORJSONResponse([
+        {
+            "id": resume_id,
+            "title": summaries[resume_id]["title"],
+            "revision": int(summaries[resume_id].get("revision", 0)),
+            "score": score,
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+        }
+        for resume_id, score, matched, missing in results
+    ])
+
+@app.post("/resume/export")
+async def export_resumes(export_request: ResumeExportRequest, current_user: dict = Depends(get_current_user)):
+    if export_request.resume_ids is None:
+        resume_ids = await db.get_user_resume_ids(current_user["id"])
+    else:
+        resume_ids = list(dict.fromkeys(export_request.resume_ids))
+    
+    # Checked on the ids alone so an oversized export is rejected before any document is loaded
+    if len(resume_ids) > EXPORT_MAX_RESUMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {EXPORT_MAX_RESUMES} resumes can be exported at once"
+        )
+    
+    if export_request.resume_ids is None:
+        resumes = await db.load_resumes(current_user["id"], resume_ids)
+        errors = []
+    else:
+        resumes = await get_resumes_by_ids(resume_ids, current_user["id"])
+        found = {resume["id"] for resume in resumes}
+        errors = [(resume_id, "Resume not found") for resume_id in resume_ids if resume_id not in found]
+    
+    # Entries are streamed as their renders finish; failures are listed in errors.txt
+    return StreamingResponse(
+        stream_resume_zip(resumes, errors),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=resumes.zip"}
+    )
+
+# Declared after the static /resume/... routes so their paths aren't taken for a resume id
+@app.get("/resume/{resume_id}", response_model=Resume)
+async def get_resume(
+    resume_id: str,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    # Revalidating a cached copy only needs the revision from the summary hash, not the document
+    if if_none_match:
+        revision = await db.get_resume_revision(resume_id, current_user["id"])
+        if revision is not None and etag_matches(if_none_match, resume_etag(revision)):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": resume_etag(revision)})
+    
+    resume = await get_resume_by_id(resume_id, current_user["id"])
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    headers = {"ETag": resume_etag(resume.get("revision", 0))}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return ORJSONResponse(resume_payload(resume), headers=headers)
 
 @app.put("/resume/{resume_id}", response_model=Resume)
-async def update_resume(resume_id: str, resume_update: ResumeUpdate, current_user: dict = Depends(get_current_user)):
+async def update_resume(
+    resume_id: str,
+    resume_update: ResumeUpdate,
+    if_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
     update_data = {}
     if resume_update.title is not None:
         update_data["title"] = resume_update.title
@@ -378,7 +735,7 @@ async def update_resume(resume_id: str, resume_update: ResumeUpdate, current_use
     if resume_update.data is not None:
         update_data["data"] = resume_update.data.dict()
     
-    updated_resume = update_resume_in_db(resume_id, update_data, current_user["id"])
+    updated_resume = await update_resume_in_db(resume_id, update_data, current_user["id"], if_match)
     
     if not updated_resume:
         raise HTTPException(
@@ -386,19 +743,41 @@ async def update_resume(resume_id: str, resume_update: ResumeUpdate, current_use
             detail="Resume not found"
         )
     
-    return Resume(
-        id=updated_resume["id"],
-        title=updated_resume["title"],
-        template=updated_resume["template"],
-        data=ResumeData(**updated_resume["data"]),
-        created_at=datetime.fromisoformat(updated_resume["created_at"]),
-        updated_at=datetime.fromisoformat(updated_resume["updated_at"]),
-        user_id=updated_resume["user_id"]
-    )
+    return ORJSONResponse(resume_payload(updated_resume), headers={"ETag": resume_etag(updated_resume["revision"])})
+
+@app.patch("/resume/{resume_id}", response_model=Resume)
+async def patch_resume(
+    resume_id: str,
+    resume_patch: ResumePatch,
+    if_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    try:
+        patched_resume = await patch_resume_in_db(resume_id, resume_patch, current_user["id"], if_match)
+    except PatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ValidationError as e:
+        # The patched document must still be a valid resume
+        raise RequestValidationError(e.errors())
+    
+    if not patched_resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    return ORJSONResponse(resume_payload(patched_resume), headers={"ETag": resume_etag(patched_resume["revision"])})
 
 @app.delete("/resume/{resume_id}")
-async def delete_resume(resume_id: str, current_user: dict = Depends(get_current_user)):
-    success = delete_resume_from_db(resume_id, current_user["id"])
+async def delete_resume(
+    resume_id: str,
+    if_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    success = await delete_resume_from_db(resume_id, current_user["id"], if_match)
     
     if not success:
         raise HTTPException(
@@ -408,9 +787,70 @@ async def delete_resume(resume_id: str, current_user: dict = Depends(get_current
     
     return {"message": "Resume deleted successfully"}
 
+@app.get("/resume/{resume_id}/revisions", response_model=List[ResumeRevision])
+async def get_resume_revisions(resume_id: str, current_user: dict = Depends(get_current_user)):
+    found = await db.get_resume_history(resume_id, current_user["id"])
+    
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    resume, history = found
+    # The history only holds superseded revisions; the current one is the live document
+    revisions = [{"revision": resume.get("revision", 0), "kind": "current", "updated_at": resume["updated_at"]}]
+    revisions.extend(list_revisions(history))
+    return ORJSONResponse(revisions)
+
+@app.get("/resume/{resume_id}/revisions/{revision}", response_model=Resume)
+async def get_resume_revision_document(resume_id: str, revision: int, current_user: dict = Depends(get_current_user)):
+    resume = await get_resume_at_revision(resume_id, current_user["id"], revision)
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Revision not found"
+        )
+    
+    # Revisions saved before a schema change may lack newer fields, so fill defaults in through the model
+    resume["data"] = ResumeData(**resume["data"]).dict()
+    return ORJSONResponse(resume_payload(resume), headers={"ETag": resume_etag(revision)})
+
+@app.post("/resume/{resume_id}/revisions/{revision}/restore", response_model=Resume)
+async def restore_resume_revision(
+    resume_id: str,
+    revision: int,
+    if_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    restored = await get_resume_at_revision(resume_id, current_user["id"], revision)
+    
+    if not restored:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Revision not found"
+        )
+    
+    # Restoring writes the old content as a new revision, so the history stays linear
+    update_data = {
+        "title": restored["title"],
+        "template": restored.get("template", "modern"),
+        "data": ResumeData(**restored["data"]).dict(),
+    }
+    restored_resume = await update_resume_in_db(resume_id, update_data, current_user["id"], if_match)
+    
+    if not restored_resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    return ORJSONResponse(resume_payload(restored_resume), headers={"ETag": resume_etag(restored_resume["revision"])})
+
 @app.get("/resume/{resume_id}/download")
 async def download_resume_pdf(resume_id: str, current_user: dict = Depends(get_current_user)):
-    resume = get_resume_by_id(resume_id, current_user["id"])
+    resume = await get_resume_by_id(resume_id, current_user["id"])
     
     if not resume:
         raise HTTPException(
@@ -419,57 +859,151 @@ async def download_resume_pdf(resume_id: str, current_user: dict = Depends(get_c
         )
     
     try:
-        # Generate PDF
-        pdf_buffer = generate_resume_pdf(resume)
-        
-        # Create filename
-        safe_title = "".join(c for c in resume["title"] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        filename = f"{safe_title}_Resume.pdf"
+        # Reuse an earlier render of the same content, rendering on the worker pool on a miss
+        pdf_file, pdf_size = await render_service.render_cached(resume)
+        filename = pdf_filename(resume["title"])
         
-        # Return PDF as streaming response
+        # Stream the file in chunks instead of holding the whole document in memory
         return StreamingResponse(
-            iter([pdf_buffer.getvalue()]),
+            iter_file(pdf_file),
             media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Content-Length": str(pdf_size),
+            }
         )
     
+    except (RenderQueueFull, RenderTimeout):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error generating PDF: {str(e)}"
         )
 
+@app.post("/render-jobs", response_model=RenderJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_render_job(job_request: RenderJobRequest, response: Response, current_user: dict = Depends(get_current_user)):
+    if db.client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Render jobs need the Redis storage backend"
+        )
+    
+    if job_request.resume_ids is None:
+        resume_ids = await db.get_user_resume_ids(current_user["id"])
+    else:
+        resume_ids = list(dict.fromkeys(job_request.resume_ids))
+    
+    if not resume_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No resumes to render"
+        )
+    if len(resume_ids) > EXPORT_MAX_RESUMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {EXPORT_MAX_RESUMES} resumes can be rendered at once"
+        )
+    
+    # Rendering happens on the job workers; the client polls the job for progress
+    job = await submit_render_job(db.client, current_user["id"], resume_ids)
+    response.headers["Location"] = f"/render-jobs/{job['id']}"
+    return render_job_response(job)
+
+@app.get("/render-jobs/{job_id}", response_model=RenderJob)
+async def get_render_job_status(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await get_render_job(db.client, job_id, current_user["id"]) if db.client else None
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Render job not found"
+        )
+    
+    return render_job_response(job)
+
+@app.get("/render-jobs/{job_id}/artifact")
+async def download_render_job_artifact(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await get_render_job(db.client, job_id, current_user["id"]) if db.client else None
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Render job not found"
+        )
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Render job is {job['status']}"
+        )
+    
+    try:
+        artifact = open(job["artifact_path"], "rb")
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Render job artifact has expired"
+        )
+    
+    return StreamingResponse(
+        iter_file(artifact),
+        media_type=job["media_type"],
+        headers={
+            "Content-Disposition": f"attachment; filename={job['artifact_name']}",
+            "Content-Length": str(os.fstat(artifact.fileno()).st_size),
+        }
+    )
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    redis_status = "connected" if redis_client and redis_client.ping() else "disconnected"
+    render_jobs_queued = None
+    try:
+        storage_status = "connected" if await db.is_connected() else "disconnected"
+        if storage_status == "connected" and db.client is not None:
+            render_jobs_queued = await db.client.llen(RENDER_JOB_QUEUE_KEY)
+    except RedisError:
+        storage_status = "disconnected"
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "redis": redis_status
+        "redis": storage_status,
+        "password_hashing": password_hasher.metrics(),
+        "pdf_cache": pdf_cache.stats(),
+        "pdf_render": render_service.metrics(),
+        "render_jobs": {"workers": render_job_workers.count, "queued": render_jobs_queued},
+        "storage": serialization.compression_stats.snapshot()
     }
 
-if __name__ == "__main__":
-    import uvicorn
+async def create_demo_user():
+    storage = create_storage()
+    if not await storage.connect(max_connections=1):
+        return
     
-    # Create demo user on startup
     demo_user_data = {
         "id": "demo_user_001",
         "full_name": "Demo User",
         "email": "hire-me@anshumat.org",
-        "hashed_password": get_password_hash("HireMe@2025!"),
+        "hashed_password": await get_password_hash("HireMe@2025!"),
         "created_at": datetime.utcnow().isoformat(),
         "resumes": []
     }
     
-    if redis_client:
-        try:
-            create_user(demo_user_data)
-            print("✅ Demo user created successfully")
-            print("📧 Email: hire-me@anshumat.org")
-            print("🔑 Password: HireMe@2025!")
-        except Exception as e:
-            print(f"⚠️  Demo user creation failed: {e}")
+    try:
+        await storage.create_user(demo_user_data)
+        print("✅ Demo user created successfully")
+        print("📧 Email: hire-me@anshumat.org")
+        print("🔑 Password: HireMe@2025!")
+    except Exception as e:
+        print(f"⚠️  Demo user creation failed: {e}")
+    finally:
+        await storage.close()
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    # Create demo user on startup
+    asyncio.run(create_demo_user())
     
     print("🚀 Starting FastAPI server...")
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
@@ -88,9 +88,11 @@ class Resume(BaseModel):
 class ResumeListItem(BaseModel):
     id: str
     title: str
-    status: str
+    template: str = "modern"
+    status: str = "draft"
     created_at: datetime
     updated_at: datetime
+    revision: int = 0
 
 # Token Models
 class Token(BaseModel):
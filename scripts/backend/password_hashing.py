@@ -0,0 +1,110 @@
+"""
+Password hashing on a bounded worker pool so bcrypt never runs on the event loop.
+bcrypt releases the GIL while hashing, so a thread pool gives real parallelism.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+# Number of threads hashing concurrently and how many requests may wait behind them
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+
+# bcrypt cost factor for new hashes; existing hashes with another cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+class PasswordHashQueueFull(Exception):
+    """Raised when the hashing queue is at capacity"""
+
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _timed(self, func, submitted_at: float, *args):
+        started_at = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._total_wait += started_at - submitted_at
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._total_run += time.monotonic() - started_at
+
+    async def _submit(self, func, *args):
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise PasswordHashQueueFull()
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        future = self._get_executor().submit(self._timed, func, time.monotonic(), *args)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future):
+        # Jobs cancelled before a worker picked them up never reach _timed
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the worker pool"""
+        return await self._submit(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password on the worker pool"""
+        return await self._submit(pwd_context.verify, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password, also returning a new hash when the stored one uses an outdated cost"""
+        return await self._submit(pwd_context.verify_and_update, plain_password, hashed_password)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / self._completed * 1000, 2) if self._completed else 0.0,
+                "avg_run_ms": round(self._total_run / self._completed * 1000, 2) if self._completed else 0.0,
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+# Its thread pool starts with the first hash and is stopped on API shutdown
+password_hasher = PasswordHasher()
@@ -0,0 +1,173 @@
+"""
+Content-addressed cache of rendered resume PDFs on local disk.
+Entries are keyed by a hash of the resume data, template and generator
+version, so any content change produces a new key and stale renders are
+never served; unused entries age out through LRU eviction.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from pdf_generator import DEFAULT_TEMPLATE, GENERATOR_VERSION, resolve_template
+
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", os.path.join(tempfile.gettempdir(), "resume_pdf_cache"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Size of the chunks PDFs are streamed to clients in
+PDF_STREAM_CHUNK_SIZE = int(os.getenv("PDF_STREAM_CHUNK_SIZE", 64 * 1024))
+
+# Temporary renders untouched for this many seconds are orphans left by a killed or abandoned render
+PDF_CACHE_TEMP_MAX_AGE = int(os.getenv("PDF_CACHE_TEMP_MAX_AGE", 60 * 60))
+
+# Eviction trims the cache down to this fraction of the limit to avoid evicting on every write
+EVICTION_LOW_WATERMARK = 0.9
+
+def render_cache_key(resume: dict) -> str:
+    """Hash everything that affects the rendered PDF"""
+    payload = json.dumps(
+        {
+            "data": resume["data"],
+            "template": resolve_template(resume.get("template", DEFAULT_TEMPLATE)),
+            "version": GENERATOR_VERSION,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def iter_file(f: BinaryIO, chunk_size: int = PDF_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file's contents in chunks and close it afterwards"""
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
+class PdfCache:
+    def __init__(self, directory: str = PDF_CACHE_DIR, max_bytes: int = PDF_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def open(self, key: str) -> Optional[Tuple[BinaryIO, int]]:
+        """Open a cached PDF for reading and mark it as recently used, returning (file, size) or None on a miss"""
+        path = self.path_for(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker between open and touch; the open handle still reads fine
+            pass
+        with self._lock:
+            self._hits += 1
+        return f, os.fstat(f.fileno()).st_size
+
+    def temp_path(self) -> str:
+        """Reserve a temporary file in the cache directory for a render to write into"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        return tmp_path
+
+    def commit(self, tmp_path: str, key: str) -> Tuple[BinaryIO, int]:
+        """Move a finished render into the cache and open it for reading, returning (file, size)"""
+        path = self.path_for(key)
+        os.replace(tmp_path, path)
+        f = open(path, "rb")
+        size = os.fstat(f.fileno()).st_size
+        # Evicting after opening keeps the file readable even if it is evicted right away
+        self._track(size)
+        return f, size
+
+    def discard(self, tmp_path: str):
+        """Remove a temporary render that will not be committed"""
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def _track(self, added: int):
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_usage()
+            else:
+                self._size += added
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        """Cached PDFs as (mtime, size, name), deleting stale temporary renders along the way"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        entries = []
+        stale_before = time.time() - PDF_CACHE_TEMP_MAX_AGE
+        for name in names:
+            is_temp = name.endswith(".tmp")
+            if not is_temp and not name.endswith(".pdf"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+                if is_temp:
+                    if stat.st_mtime < stale_before:
+                        os.unlink(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _disk_usage(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # Rescan so entries written by other workers sharing the directory are accounted for
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = self.max_bytes * EVICTION_LOW_WATERMARK
+        for _, entry_size, name in entries:
+            if size <= target:
+                break
+            try:
+                os.unlink(os.path.join(self.directory, name))
+                self._evictions += 1
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "max_bytes": self.max_bytes,
+                "size_bytes": self._size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+# The render job workers open their own instance on the same directory
+pdf_cache = PdfCache()
@@ -1,68 +1,90 @@
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from io import BytesIO
+from functools import lru_cache
 import json
 from datetime import datetime
 
-class ResumeGenerator:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
+DEFAULT_TEMPLATE = "modern"
+
+# Bump whenever the layout changes so cached renders are not reused
+GENERATOR_VERSION = "1"
+
+# Accent color per template; unknown templates render with the default one
+TEMPLATE_ACCENT_COLORS = {
+    "modern": "#15803d",
+}
+
+def resolve_template(template: str) -> str:
+    return template if template in TEMPLATE_ACCENT_COLORS else DEFAULT_TEMPLATE
+
+@lru_cache(maxsize=None)
+def build_stylesheet(template: str = DEFAULT_TEMPLATE) -> StyleSheet1:
+    """Build the stylesheet for a template once per process; it is only read while rendering"""
+    styles = getSampleStyleSheet()
+    accent = colors.HexColor(TEMPLATE_ACCENT_COLORS[resolve_template(template)])
     
-    def setup_custom_styles(self):
-        # Custom styles for resume
-        self.styles.add(ParagraphStyle(
-            name='ResumeTitle',
-            parent=self.styles['Title'],
-            fontSize=24,
-            spaceAfter=12,
-            textColor=colors.HexColor('#15803d'),
-            alignment=TA_CENTER
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            spaceAfter=6,
-            spaceBefore=12,
-            textColor=colors.HexColor('#15803d'),
-            borderWidth=1,
-            borderColor=colors.HexColor('#15803d'),
-            borderPadding=3
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='ContactInfo',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            spaceAfter=12
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='JobTitle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#374151'),
-            spaceBefore=6,
-            leftIndent=20
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='JobDetails',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#6b7280'),
-            leftIndent=20
-        ))
+    # Custom styles for resume
+    styles.add(ParagraphStyle(
+        name='ResumeTitle',
+        parent=styles['Title'],
+        fontSize=24,
+        spaceAfter=12,
+        textColor=accent,
+        alignment=TA_CENTER
+    ))
     
-    def generate_pdf(self, resume_data: dict) -> BytesIO:
-        buffer = BytesIO()
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=6,
+        spaceBefore=12,
+        textColor=accent,
+        borderWidth=1,
+        borderColor=accent,
+        borderPadding=3
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='ContactInfo',
+        parent=styles['Normal'],
+        fontSize=10,
+        alignment=TA_CENTER,
+        spaceAfter=12
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='JobTitle',
+        parent=styles['Normal'],
+        fontSize=12,
+        textColor=colors.HexColor('#374151'),
+        spaceBefore=6,
+        leftIndent=20
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='JobDetails',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#6b7280'),
+        leftIndent=20
+    ))
+    return styles
+
+class ResumeGenerator:
+    # Holds no per-render state, so one instance can serve concurrent renders
+    def __init__(self, template: str = DEFAULT_TEMPLATE):
+        self.template = resolve_template(template)
+        self.styles = build_stylesheet(self.template)
+    
+    def generate_pdf(self, resume_data: dict, output=None) -> BytesIO:
+        # Render straight into `output` (a path or binary file) when given, avoiding an in-memory copy
+        buffer = output if output is not None else BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch)
         story = []
         
@@ -150,9 +172,20 @@ class ResumeGenerator:
         
         # Build PDF
         doc.build(story)
-        buffer.seek(0)
+        if output is None:
+            buffer.seek(0)
         return buffer
 
-def generate_resume_pdf(resume_data: dict) -> BytesIO:
-    generator = ResumeGenerator()
-    return generator.generate_pdf(resume_data)
+def pdf_filename(title: str) -> str:
+    """Build a download filename from a resume title"""
+    safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    return f"{safe_title}_Resume.pdf"
+
+@lru_cache(maxsize=None)
+def get_resume_generator(template: str = DEFAULT_TEMPLATE) -> ResumeGenerator:
+    """Return the shared generator for a template"""
+    return ResumeGenerator(resolve_template(template))
+
+def generate_resume_pdf(resume_data: dict, output=None) -> BytesIO:
+    generator = get_resume_generator(resolve_template(resume_data.get('template', DEFAULT_TEMPLATE)))
+    return generator.generate_pdf(resume_data, output)
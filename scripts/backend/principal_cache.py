@@ -0,0 +1,65 @@
+"""
+In-process cache of authenticated users so authorizing a request doesn't
+need a Redis round trip. Entries are keyed by token subject (email) and
+expire after a short TTL, which also bounds staleness across workers.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 30))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", 10000))
+
+# Fields of the stored user record that never belong in a cached principal
+PRIVATE_USER_FIELDS = ("hashed_password",)
+
+def to_principal(user: dict) -> dict:
+    """Strip secrets from a user record before it is cached or handed to handlers"""
+    return {key: value for key, value in user.items() if key not in PRIVATE_USER_FIELDS}
+
+class PrincipalCache:
+    def __init__(self, max_size: int = AUTH_CACHE_MAX_SIZE, ttl: float = AUTH_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[dict]:
+        """Return the cached principal for a subject, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at < time.monotonic():
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+            return dict(principal)
+
+    def set(self, subject: str, user: dict) -> dict:
+        """Cache a user record under its subject and return the principal"""
+        principal = to_principal(user)
+        if self.ttl <= 0 or self.max_size <= 0:
+            return principal
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return dict(principal)
+
+    def invalidate(self, subject: str):
+        """Drop a subject, e.g. after its user record changed"""
+        with self._lock:
+            self._entries.pop(subject, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# One per API process; other processes only see an invalidation once their entry expires
+principal_cache = PrincipalCache()
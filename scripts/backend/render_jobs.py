@@ -0,0 +1,309 @@
+"""
+Asynchronous PDF render jobs. Jobs are queued in Redis and served by
+background worker processes started alongside the API (or standalone via
+`python render_jobs.py`), so HTTP request time is decoupled from render time.
+Finished jobs leave an artifact on disk: a PDF for one resume, a ZIP otherwise.
+
+A worker moves each job into its own processing list and only removes it
+once the job reached a final state, so a job interrupted by a crash or a
+killed worker is requeued when a worker next starts.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from datetime import datetime
+from typing import List, Optional
+
+from bulk_export import export_entry_name
+from database import close_redis_client, create_redis_client
+from pdf_cache import pdf_cache, render_cache_key
+from pdf_generator import generate_resume_pdf, pdf_filename
+from resume_store import fetch_resumes
+
+RENDER_JOB_WORKERS = int(os.getenv("RENDER_JOB_WORKERS", 1))
+RENDER_JOB_DIR = os.getenv("RENDER_JOB_DIR", os.path.join(tempfile.gettempdir(), "resume_render_jobs"))
+
+# Job records and artifacts are kept this many seconds after the job was submitted
+RENDER_JOB_TTL = int(os.getenv("RENDER_JOB_TTL", 24 * 60 * 60))
+
+# A job interrupted this many times (e.g. because it keeps crashing its worker) is failed instead of requeued
+RENDER_JOB_MAX_ATTEMPTS = int(os.getenv("RENDER_JOB_MAX_ATTEMPTS", 3))
+
+# Seconds shutdown waits for workers to finish their current job before killing them
+RENDER_JOB_SHUTDOWN_TIMEOUT = float(os.getenv("RENDER_JOB_SHUTDOWN_TIMEOUT", 30))
+
+RENDER_JOB_QUEUE_KEY = "render_jobs:queue"
+
+# Seconds a worker blocks waiting for work before sweeping expired artifacts and checking for shutdown
+WORKER_POLL_TIMEOUT = 5
+
+# Seconds a worker slot stays claimed without a heartbeat; a dead worker's slot is taken over after this
+WORKER_LEASE_TIMEOUT = 60
+
+def render_job_key(job_id: str) -> str:
+    return f"render_job:{job_id}"
+
+def worker_slot_key(slot: int) -> str:
+    return f"render_jobs:worker:{slot}"
+
+def processing_key(slot: int) -> str:
+    """Jobs the worker holding a slot has taken off the queue and not finished yet"""
+    return f"render_jobs:processing:{slot}"
+
+async def submit_render_job(client, user_id: str, resume_ids: List[str]) -> dict:
+    """Record a queued job and push it onto the render queue"""
+    now = datetime.utcnow().isoformat()
+    job = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "resume_ids": json.dumps(resume_ids),
+        "status": "queued",
+        "total": len(resume_ids),
+        "completed": 0,
+        "failed": 0,
+        "errors": "[]",
+        "attempts": 0,
+        "created_at": now,
+        "updated_at": now,
+    }
+    pipe = client.pipeline()
+    pipe.hset(render_job_key(job["id"]), mapping=job)
+    pipe.expire(render_job_key(job["id"]), RENDER_JOB_TTL)
+    pipe.rpush(RENDER_JOB_QUEUE_KEY, job["id"])
+    await pipe.execute()
+    return job
+
+async def get_render_job(client, job_id: str, user_id: str) -> Optional[dict]:
+    """Load a job owned by the user, or None"""
+    job = await client.hgetall(render_job_key(job_id))
+    if not job or job["user_id"] != user_id:
+        return None
+    return job
+
+def _render_into_cache(resume: dict) -> str:
+    """Render a resume into the shared PDF cache unless already there, returning the cached path"""
+    cache_key = render_cache_key(resume)
+    cached = pdf_cache.open(cache_key)
+    if cached is None:
+        tmp_path = pdf_cache.temp_path()
+        try:
+            with open(tmp_path, "wb") as f:
+                generate_resume_pdf(resume, f)
+            cached = pdf_cache.commit(tmp_path, cache_key)
+        except BaseException:
+            # Rendering runs in this process, so nothing is still writing the file by now
+            pdf_cache.discard(tmp_path)
+            raise
+    pdf_file, _ = cached
+    return pdf_file
+
+async def _update_job(client, job_id: str, **fields):
+    fields["updated_at"] = datetime.utcnow().isoformat()
+    await client.hset(render_job_key(job_id), mapping=fields)
+
+async def _run_job(client, job_id: str):
+    job = await client.hgetall(render_job_key(job_id))
+    if not job:
+        # Expired before a worker got to it
+        return
+
+    if int(job.get("attempts", 0)) >= RENDER_JOB_MAX_ATTEMPTS:
+        # Every earlier attempt was interrupted, most likely because this job takes its worker down
+        errors = json.loads(job["errors"]) + [["", "Render job was interrupted too many times"]]
+        await _update_job(client, job_id, status="failed", errors=json.dumps(errors))
+        return
+
+    await _update_job(client, job_id, status="running")
+    await client.hincrby(render_job_key(job_id), "attempts", 1)
+    resume_ids = json.loads(job["resume_ids"])
+    resumes, _ = await fetch_resumes(client, resume_ids)
+    resumes = [resume for resume in resumes if resume["user_id"] == job["user_id"]]
+    found = {resume["id"] for resume in resumes}
+    errors = [[resume_id, "Resume not found"] for resume_id in resume_ids if resume_id not in found]
+
+    os.makedirs(RENDER_JOB_DIR, exist_ok=True)
+    single = len(resume_ids) == 1 and len(resumes) == 1
+    suffix = ".pdf" if single else ".zip"
+    artifact_path = os.path.join(RENDER_JOB_DIR, f"{job_id}{suffix}")
+    tmp_path = f"{artifact_path}.tmp"
+
+    try:
+        archive = None if single else zipfile.ZipFile(tmp_path, mode="w", compression=zipfile.ZIP_STORED)
+        completed = 0
+        for resume in resumes:
+            try:
+                # Rendering blocks this worker process only, never the API's event loop
+                pdf_file = _render_into_cache(resume)
+            except Exception as e:
+                errors.append([resume["id"], str(e) or type(e).__name__])
+            else:
+                # Copy from the open handle so a concurrent cache eviction can't break the artifact
+                with pdf_file:
+                    if archive is None:
+                        with open(tmp_path, "wb") as f:
+                            shutil.copyfileobj(pdf_file, f)
+                    else:
+                        with archive.open(export_entry_name(resume), mode="w") as entry:
+                            shutil.copyfileobj(pdf_file, entry)
+                completed += 1
+            await _update_job(client, job_id, completed=completed, failed=len(errors), errors=json.dumps(errors))
+
+        if archive is not None:
+            if errors:
+                report = "\n".join(f"{resume_id}: {message}" for resume_id, message in errors)
+                archive.writestr("errors.txt", report + "\n")
+            archive.close()
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        await _update_job(client, job_id, status="failed", errors=json.dumps(errors + [["", str(e)]]))
+        return
+
+    if completed == 0:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        await _update_job(client, job_id, status="failed", failed=len(errors), errors=json.dumps(errors))
+        return
+
+    os.replace(tmp_path, artifact_path)
+    artifact_name = pdf_filename(resumes[0]["title"]) if single else "resumes.zip"
+    await _update_job(
+        client,
+        job_id,
+        status="completed",
+        artifact_path=artifact_path,
+        artifact_name=artifact_name,
+        media_type="application/pdf" if single else "application/zip",
+    )
+
+def _sweep_artifacts():
+    """Delete artifacts of jobs older than the TTL"""
+    cutoff = time.time() - RENDER_JOB_TTL
+    try:
+        names = os.listdir(RENDER_JOB_DIR)
+    except FileNotFoundError:
+        return
+    for name in names:
+        path = os.path.join(RENDER_JOB_DIR, name)
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+async def _claim_slot(client) -> int:
+    """Claim the lowest worker slot no live worker holds"""
+    slot = 0
+    while not await client.set(worker_slot_key(slot), os.getpid(), nx=True, ex=WORKER_LEASE_TIMEOUT):
+        slot += 1
+    return slot
+
+async def _hold_slot(client, slot: int):
+    while True:
+        await asyncio.sleep(WORKER_LEASE_TIMEOUT / 3)
+        await client.expire(worker_slot_key(slot), WORKER_LEASE_TIMEOUT)
+
+async def _recover_jobs(client, slot: int):
+    """Requeue the jobs a slot's previous holder took off the queue but never finished"""
+    while True:
+        # Back to the head of the queue, they have already waited their turn
+        job_id = await client.lmove(processing_key(slot), RENDER_JOB_QUEUE_KEY, "RIGHT", "LEFT")
+        if job_id is None:
+            return
+        if await client.exists(render_job_key(job_id)):
+            await _update_job(client, job_id, status="queued")
+
+async def _recover_abandoned_jobs(client, slot: int):
+    """Requeue unfinished jobs of this slot and of every slot no live worker holds"""
+    await _recover_jobs(client, slot)
+    async for key in client.scan_iter(match=processing_key("*")):
+        other = int(key.rsplit(":", 1)[1])
+        if not await client.exists(worker_slot_key(other)):
+            await _recover_jobs(client, other)
+
+async def _worker_loop(stop):
+    client = await create_redis_client(max_connections=3)
+    if client is None:
+        return
+    slot = await _claim_slot(client)
+    heartbeat = asyncio.create_task(_hold_slot(client, slot))
+    try:
+        await _recover_abandoned_jobs(client, slot)
+        while not stop.is_set():
+            job_id = await client.blmove(
+                RENDER_JOB_QUEUE_KEY, processing_key(slot), WORKER_POLL_TIMEOUT, src="LEFT", dest="RIGHT"
+            )
+            if job_id is None:
+                _sweep_artifacts()
+                continue
+            try:
+                await _run_job(client, job_id)
+            except Exception as e:
+                print(f"❌ Render job {job_id} failed: {e}")
+                await _update_job(client, job_id, status="failed", errors=json.dumps([["", str(e)]]))
+            # Acknowledge only once the job reached a final state
+            await client.lrem(processing_key(slot), 1, job_id)
+        await client.delete(worker_slot_key(slot))
+    finally:
+        heartbeat.cancel()
+        await close_redis_client(client)
+
+def run_worker(stop=None):
+    """Serve render jobs until `stop` is set; standalone, SIGINT and SIGTERM set it"""
+    if stop is None:
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+    else:
+        # The owning process decides when to stop, so Ctrl+C in its terminal doesn't cut a job short
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_worker_loop(stop))
+
+class RenderJobWorkers:
+    """Background worker processes started and stopped with the API"""
+
+    def __init__(self, count: int = RENDER_JOB_WORKERS, shutdown_timeout: float = RENDER_JOB_SHUTDOWN_TIMEOUT):
+        self.count = count
+        self.shutdown_timeout = shutdown_timeout
+        self._processes = []
+        self._stop = None
+
+    def start(self):
+        context = multiprocessing.get_context("spawn")
+        if self._stop is None:
+            self._stop = context.Event()
+        while len(self._processes) < self.count:
+            process = context.Process(target=run_worker, args=(self._stop,), name="render-job-worker", daemon=True)
+            process.start()
+            self._processes.append(process)
+
+    def shutdown(self):
+        """Let workers finish their current job, killing those still busy after the shutdown timeout"""
+        if self._stop is not None:
+            self._stop.set()
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in self._processes:
+            process.join(timeout=max(0, deadline - time.monotonic()))
+        for process in self._processes:
+            if process.is_alive():
+                # Its job stays in the slot's processing list and is requeued when the slot is taken over
+                process.terminate()
+                process.join(timeout=5)
+        self._processes = []
+        self._stop = None
+
+# Worker processes owned by the API process
+render_job_workers = RenderJobWorkers()
+
+if __name__ == "__main__":
+    print("🚀 Starting render job worker...")
+    run_worker()
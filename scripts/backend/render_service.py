@@ -0,0 +1,165 @@
+"""
+Process-pool PDF render service. ReportLab layout is pure-Python CPU work,
+so renders run in worker processes instead of on the event loop, with a
+bounded queue, a per-job timeout and render metrics.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Tuple
+
+from pdf_generator import DEFAULT_TEMPLATE, build_stylesheet, generate_resume_pdf
+from pdf_cache import pdf_cache, render_cache_key
+
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", os.cpu_count() or 2))
+PDF_RENDER_MAX_QUEUE = int(os.getenv("PDF_RENDER_MAX_QUEUE", 32))
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", 30))
+
+# Seconds clients are asked to wait before retrying when the queue is full
+PDF_RENDER_RETRY_AFTER = int(os.getenv("PDF_RENDER_RETRY_AFTER", 2))
+
+class RenderQueueFull(Exception):
+    """Raised when every worker is busy and the render queue is at capacity"""
+
+class RenderTimeout(Exception):
+    """Raised when a render does not finish within the configured timeout"""
+
+def _warm_up_worker():
+    # Build the default stylesheet up front so the first render doesn't pay for it
+    build_stylesheet(DEFAULT_TEMPLATE)
+
+def _render_pdf_to_file(resume: dict, path: str) -> int:
+    # Write straight to disk so the PDF never has to travel back through the parent process
+    with open(path, "wb") as f:
+        generate_resume_pdf(resume, f)
+        return f.tell()
+
+class RenderService:
+    def __init__(
+        self,
+        workers: int = PDF_RENDER_WORKERS,
+        max_queue: int = PDF_RENDER_MAX_QUEUE,
+        timeout: float = PDF_RENDER_TIMEOUT,
+    ):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._rejected = 0
+        self._total_render = 0.0
+        self._max_render = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def start(self):
+        if self._executor is None:
+            # spawn avoids forking the event loop and Redis connections of the API process
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up_worker,
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise RenderQueueFull()
+            self._in_flight += 1
+            self._submitted += 1
+
+    def _on_done(self, future, submitted_at: float):
+        # Runs when the worker actually finishes, so timed-out jobs hold their slot until then
+        elapsed = time.monotonic() - submitted_at
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self._failed += 1
+                return
+            self._completed += 1
+            self._total_render += elapsed
+            self._max_render = max(self._max_render, elapsed)
+
+    async def render(self, resume: dict, path: str) -> int:
+        """Render a resume into the PDF file at `path` on the worker pool, returning its size; `path` is removed on failure"""
+        try:
+            self.start()
+            self._reserve_slot()
+        except BaseException:
+            # Nothing will ever write `path`, e.g. when the queue is full
+            pdf_cache.discard(path)
+            raise
+
+        submitted_at = time.monotonic()
+        try:
+            future = self._executor.submit(_render_pdf_to_file, resume, path)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            pdf_cache.discard(path)
+            raise
+        future.add_done_callback(lambda done: self._on_done(done, submitted_at))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except BaseException as e:
+            # The worker may still be writing `path`; remove it only once the worker is done with it
+            future.add_done_callback(lambda done: pdf_cache.discard(path))
+            if isinstance(e, asyncio.TimeoutError):
+                with self._lock:
+                    self._timed_out += 1
+                raise RenderTimeout()
+            raise
+
+    async def render_cached(self, resume: dict) -> Tuple[BinaryIO, int]:
+        """Open the cached PDF of a resume, rendering it into the cache first on a miss; returns (file, size)"""
+        cache_key = render_cache_key(resume)
+        cached = pdf_cache.open(cache_key)
+        if cached is not None:
+            return cached
+
+        tmp_path = pdf_cache.temp_path()
+        await self.render(resume, tmp_path)
+        try:
+            return pdf_cache.commit(tmp_path, cache_key)
+        except BaseException:
+            pdf_cache.discard(tmp_path)
+            raise
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+                "rejected": self._rejected,
+                "avg_render_ms": round(self._total_render / self._completed * 1000, 2) if self._completed else 0.0,
+                "max_render_ms": round(self._max_render * 1000, 2),
+            }
+
+# Started by the API lifespan, or by the first render outside it
+render_service = RenderService()
@@ -0,0 +1,212 @@
+"""
+ASGI middleware compressing API responses with zstd, brotli or gzip,
+whichever the client accepts and is installed (gzip always is). Only
+allowlisted text-like content types above a size threshold are compressed;
+PDFs, ZIPs and responses that already carry a Content-Encoding pass
+through untouched. Streaming responses are compressed chunk by chunk.
+"""
+
+import os
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bodies smaller than this are sent as-is
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", 1024))
+
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", 6))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", 4))
+RESPONSE_ZSTD_LEVEL = int(os.getenv("RESPONSE_ZSTD_LEVEL", 3))
+
+# Media types (or "type/" prefixes) worth compressing; binary formats are already compressed
+RESPONSE_COMPRESSION_TYPES = tuple(
+    media_type.strip()
+    for media_type in os.getenv(
+        "RESPONSE_COMPRESSION_TYPES",
+        "application/json,application/problem+json,application/x-ndjson,text/",
+    ).split(",")
+    if media_type.strip()
+)
+
+class GzipCompressor:
+    def __init__(self):
+        # wbits=31 writes a gzip header and trailer
+        self._compressor = zlib.compressobj(RESPONSE_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+class BrotliCompressor:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=RESPONSE_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class ZstdCompressor:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=RESPONSE_ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+# Server preference order, used to break ties between equally weighted encodings
+COMPRESSORS = {}
+if zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+COMPRESSORS["gzip"] = GzipCompressor
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header, or None"""
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in COMPRESSORS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return any(
+        media_type.startswith(allowed) if allowed.endswith("/") else media_type == allowed
+        for allowed in RESPONSE_COMPRESSION_TYPES
+    )
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = RESPONSE_COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = CompressionResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+class CompressionResponder:
+    """Holds back the response start until the first body chunk shows whether to compress"""
+
+    def __init__(self, send, encoding: Optional[str], minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self._start = None
+        self._compressor = None
+
+    def _eligible(self, status: int, headers: MutableHeaders) -> bool:
+        return (
+            status not in (204, 304)
+            and "content-encoding" not in headers
+            and is_compressible(headers.get("content-type", ""))
+        )
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self._start is not None:
+            await self._start_body(message)
+        elif self._compressor is not None:
+            body = self._compressor.compress(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            body += self._compressor.flush() if more_body else self._compressor.finish()
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+        else:
+            await self._send(message)
+
+    async def _start_body(self, message):
+        start, self._start = self._start, None
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self._eligible(start["status"], headers):
+            await self._send(start)
+            await self._send(message)
+            return
+
+        # Caches must key eligible responses on Accept-Encoding whether or not this one is compressed
+        headers.add_vary_header("Accept-Encoding")
+        content_length = headers.get("content-length")
+        too_small = (
+            (not more_body and len(body) < self.minimum_size)
+            or (content_length is not None and int(content_length) < self.minimum_size)
+        )
+        if self.encoding is None or too_small:
+            await self._send(start)
+            await self._send(message)
+            return
+
+        compressor = COMPRESSORS[self.encoding]()
+        headers["Content-Encoding"] = self.encoding
+        # The encoded bytes differ from the identity representation, so its validator becomes weak
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        if not more_body:
+            body = compressor.compress(body) + compressor.finish()
+            headers["Content-Length"] = str(len(body))
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+
+        if content_length is not None:
+            del headers["Content-Length"]
+        self._compressor = compressor
+        await self._send(start)
+        body = compressor.compress(body) + compressor.flush()
+        await self._send({"type": "http.response.body", "body": body, "more_body": True})
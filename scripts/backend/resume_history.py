@@ -0,0 +1,163 @@
+"""
+Resume version history. The live document is the only full copy of the
+current revision; each write records the revision it replaces in a history
+hash as a reverse delta from its successor: a merge patch for the document
+plus section operations for experience/education entries, so editing one
+entry stores just that edit. Older revisions are rebuilt by walking back
+from the live document. Every RESUME_HISTORY_SNAPSHOT_INTERVAL-th revision
+is kept whole once superseded, which bounds how many deltas a
+reconstruction replays, and revisions older than the retention window are
+dropped.
+"""
+
+import copy
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from resume_patch import PATCHABLE_SECTIONS, apply_section_operation, diff_merge_patch, merge_patch
+
+# Superseded revisions whose number is a multiple of this are stored as full snapshots
+RESUME_HISTORY_SNAPSHOT_INTERVAL = max(1, int(os.getenv("RESUME_HISTORY_SNAPSHOT_INTERVAL", 10)))
+
+# Revisions kept per resume, counting the live one; 0 disables history
+RESUME_HISTORY_RETENTION = int(os.getenv("RESUME_HISTORY_RETENTION", 50))
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+def resume_history_key(resume_id: str) -> str:
+    """Hash of a resume's recorded revisions, with fields named "<revision>:<kind>" """
+    return f"resume_history:{resume_id}"
+
+def history_field(revision: int, kind: str) -> str:
+    return f"{revision}:{kind}"
+
+def parse_history_field(field) -> Tuple[int, str]:
+    if isinstance(field, bytes):
+        field = field.decode("utf-8")
+    revision, _, kind = field.partition(":")
+    return int(revision), kind
+
+def _section_operations(old_entries: list, new_entries: list) -> Optional[List[dict]]:
+    """Section operations turning one entry list into another, or None when only a full replacement can"""
+    if not all(isinstance(entry, dict) and "id" in entry for entry in old_entries + new_entries):
+        return None
+    old_by_id = {entry["id"]: entry for entry in old_entries}
+    new_ids = [entry["id"] for entry in new_entries]
+    if len(old_by_id) != len(old_entries) or len(set(new_ids)) != len(new_ids):
+        return None
+
+    # Upserts append new entries, so kept entries must stay in order and come before any new one
+    kept = [entry_id for entry_id in new_ids if entry_id in old_by_id]
+    if kept != [entry["id"] for entry in old_entries if entry["id"] in set(new_ids)]:
+        return None
+    if kept and new_ids[:len(kept)] != kept:
+        return None
+
+    operations = [{"op": "remove", "id": entry["id"]} for entry in old_entries if entry["id"] not in set(new_ids)]
+    for entry in new_entries:
+        old_entry = old_by_id.get(entry["id"])
+        if old_entry is None:
+            # Upserts drop null fields, so a new entry holding nulls needs the full list
+            if any(value is None for value in entry.values()):
+                return None
+            operations.append({"op": "upsert", "id": entry["id"], "item": copy.deepcopy(entry)})
+        elif old_entry != entry:
+            # A field set to null would read as a deletion, so such edits need the full list too
+            item = diff_merge_patch(old_entry, entry)
+            if any(value is None for value in item.values()):
+                return None
+            operations.append({"op": "upsert", "id": entry["id"], "item": item})
+    return operations
+
+def diff_resume(source: dict, target: dict) -> dict:
+    """Delta turning one revision into another"""
+    source_data = source.get("data") or {}
+    target_data = target.get("data") or {}
+    operations = []
+    stripped_source = dict(source_data)
+    stripped_target = dict(target_data)
+    for section in PATCHABLE_SECTIONS:
+        old_entries = source_data.get(section)
+        new_entries = target_data.get(section)
+        if not isinstance(old_entries, list) or not isinstance(new_entries, list):
+            continue
+        section_operations = _section_operations(old_entries, new_entries)
+        if section_operations is None:
+            continue
+        operations.extend({**operation, "section": section} for operation in section_operations)
+        stripped_source.pop(section)
+        stripped_target.pop(section)
+
+    patch = diff_merge_patch({**source, "data": stripped_source}, {**target, "data": stripped_target})
+    return {"patch": patch, "operations": operations}
+
+def apply_delta(source: dict, delta: dict) -> dict:
+    target = merge_patch(source, delta["patch"])
+    target["data"] = copy.deepcopy(target.get("data") or {})
+    for operation in delta["operations"]:
+        apply_section_operation(target["data"], operation["op"], operation["section"], operation["id"], operation.get("item"))
+    return target
+
+def record_revision(
+    resume: dict, previous: Optional[dict], fields: Iterable
+) -> Tuple[Dict[str, dict], List]:
+    """History entries to write when `resume` replaces `previous` and the existing fields to drop, given the current fields"""
+    existing = {parse_history_field(field): field for field in fields}
+    if RESUME_HISTORY_RETENTION <= 0:
+        return {}, list(existing.values())
+
+    # Each delta only depends on newer revisions, so the oldest can always be dropped
+    window_start = resume["revision"] - RESUME_HISTORY_RETENTION + 1
+    drops = [field for (rev, kind), field in existing.items() if rev < window_start]
+
+    entries = {}
+    superseded = previous.get("revision", 0) if previous is not None else None
+    if superseded is not None and superseded >= window_start:
+        delta = diff_resume(resume, previous)
+        # Merge patches can't tell a null value from a deleted key; such revisions are stored whole
+        if superseded % RESUME_HISTORY_SNAPSHOT_INTERVAL and apply_delta(resume, delta) == previous:
+            entries[history_field(superseded, DELTA)] = {"delta": delta}
+        else:
+            entries[history_field(superseded, SNAPSHOT)] = {"snapshot": previous}
+    return entries, drops
+
+def list_revisions(history: Dict) -> List[dict]:
+    """Superseded revisions recorded in a decoded history hash, newest first"""
+    revisions = []
+    for field, entry in history.items():
+        revision, kind = parse_history_field(field)
+        resume = entry["snapshot"] if kind == SNAPSHOT else None
+        revisions.append({
+            "revision": revision,
+            "kind": kind,
+            "updated_at": resume["updated_at"] if resume else entry["delta"]["patch"].get("updated_at"),
+        })
+    revisions.sort(key=lambda item: item["revision"], reverse=True)
+    return revisions
+
+def reconstruct(resume: dict, history: Dict, revision: int) -> Optional[dict]:
+    """Rebuild a revision by walking back from the live resume, or from the oldest snapshot after it; None when it isn't recorded"""
+    current = resume.get("revision", 0)
+    if revision == current:
+        return copy.deepcopy(resume)
+
+    entries = {}
+    for field, entry in history.items():
+        rev, kind = parse_history_field(field)
+        entries[rev] = (kind, entry)
+    if revision not in entries or revision > current:
+        return None
+
+    base = min((rev for rev, (kind, _) in entries.items() if kind == SNAPSHOT and revision <= rev < current), default=None)
+    if base is None:
+        base, document = current, resume
+    else:
+        document = entries[base][1]["snapshot"]
+    document = copy.deepcopy(document)
+    for rev in range(base - 1, revision - 1, -1):
+        if rev not in entries:
+            return None
+        kind, entry = entries[rev]
+        document = copy.deepcopy(entry["snapshot"]) if kind == SNAPSHOT else apply_delta(document, entry["delta"])
+    return document
@@ -0,0 +1,126 @@
+"""
+Job-description matching. Each resume is reduced to a sparse term-frequency
+vector over its skills and experience descriptions; vectors are cached per
+resume and revision, so scoring a job description against many resume
+variants only tokenizes the job description. Scores are the cosine
+similarity of TF-IDF vectors, with IDF taken over the caller's resumes.
+"""
+
+import math
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from search_index import tokenize
+
+MATCH_VECTOR_CACHE_SIZE = int(os.getenv("MATCH_VECTOR_CACHE_SIZE", 10000))
+
+# Most matched / missing keywords reported per resume
+MATCH_MAX_KEYWORDS = int(os.getenv("MATCH_MAX_KEYWORDS", 20))
+
+# A skill counts as this many mentions in free text
+MATCH_SKILL_WEIGHT = 2
+
+# Boilerplate that shows up in most job postings and says nothing about the role
+JOB_STOP_WORDS = frozenset("""
+    ability able about across all also an any apply candidate candidates company
+    customers daily degree environment equivalent excellent experience experienced
+    familiarity familiar good great help highly ideal including join just knowledge
+    like looking make must new nice one other plus position preferred problem
+    problems proficiency proven related required requirements responsibilities
+    role skills solid strong team teams understanding using want well what who
+    work working would years year you your
+""".split())
+
+def term_frequencies(counts: Dict[str, float]) -> Dict[str, float]:
+    """Sublinear term frequencies, so a term repeated ten times doesn't dominate"""
+    return {term: 1 + math.log(count) for term, count in counts.items()}
+
+def resume_vector(resume: dict) -> Dict[str, float]:
+    """Term-frequency vector of a resume's skills and experience descriptions"""
+    data = resume.get("data") or {}
+    counts = Counter()
+    for skill in data.get("skills") or []:
+        for term in tokenize(skill):
+            counts[term] += MATCH_SKILL_WEIGHT
+    for entry in data.get("experience") or []:
+        counts.update(tokenize(entry.get("description") or ""))
+    return term_frequencies(counts)
+
+def job_vector(job_description: str) -> Dict[str, float]:
+    """Term-frequency vector of a job description, without posting boilerplate"""
+    return term_frequencies(Counter(
+        term for term in tokenize(job_description) if term not in JOB_STOP_WORDS
+    ))
+
+class ResumeVectorCache:
+    """LRU of resume vectors keyed by resume id; an entry is only valid for the revision it was built from"""
+
+    def __init__(self, max_size: int = MATCH_VECTOR_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, resume_id: str, revision: int) -> Optional[Dict[str, float]]:
+        with self._lock:
+            entry = self._entries.get(resume_id)
+            if entry is None or entry[0] != revision:
+                return None
+            self._entries.move_to_end(resume_id)
+            return entry[1]
+
+    def set(self, resume_id: str, revision: int, vector: Dict[str, float]):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[resume_id] = (revision, vector)
+            self._entries.move_to_end(resume_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, resume_id: str):
+        """Drop a resume, e.g. after it was deleted"""
+        with self._lock:
+            self._entries.pop(resume_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def inverse_document_frequencies(vectors: List[Dict[str, float]]) -> Dict[str, float]:
+    """Smoothed IDF of every term in a set of resume vectors"""
+    document_frequency = Counter()
+    for vector in vectors:
+        document_frequency.update(vector.keys())
+    total = len(vectors)
+    return {term: math.log((1 + total) / (1 + count)) + 1 for term, count in document_frequency.items()}
+
+def score_resumes(
+    job: Dict[str, float], vectors: Dict[str, Dict[str, float]], max_keywords: int = MATCH_MAX_KEYWORDS
+) -> List[Tuple[str, float, List[str], List[str]]]:
+    """Rank resume vectors against a job vector as [(resume_id, score, matched, missing)], best first"""
+    idf = inverse_document_frequencies(list(vectors.values()))
+    # Terms no resume contains get the IDF of a term seen in no document
+    unseen_idf = math.log(1 + len(vectors)) + 1
+
+    job_weights = {term: tf * idf.get(term, unseen_idf) for term, tf in job.items()}
+    job_norm = math.sqrt(sum(weight * weight for weight in job_weights.values()))
+    keywords = sorted(job_weights, key=lambda term: (-job_weights[term], term))
+
+    results = []
+    for resume_id, vector in vectors.items():
+        resume_norm = math.sqrt(sum((tf * idf[term]) ** 2 for term, tf in vector.items()))
+        # Only terms shared with the job description contribute to the dot product
+        dot = sum(weight * vector[term] * idf[term] for term, weight in job_weights.items() if term in vector)
+        score = dot / (job_norm * resume_norm) if job_norm and resume_norm else 0.0
+
+        matched = [term for term in keywords if term in vector][:max_keywords]
+        missing = [term for term in keywords if term not in vector][:max_keywords]
+        results.append((resume_id, round(score, 4), matched, missing))
+
+    results.sort(key=lambda result: (-result[1], result[0]))
+    return results
+
+# Entries are checked against the resume revision, so processes never need to invalidate each other
+resume_vector_cache = ResumeVectorCache()
@@ -0,0 +1,88 @@
+"""
+Partial resume updates: JSON merge-patch (RFC 7396) for any part of the
+document plus section operations that upsert or remove a single
+experience/education entry by its id, so autosave payloads stay as small
+as the edit itself.
+"""
+
+import copy
+from typing import List, Optional
+
+# Resume sections whose entries are addressed by their `id`
+PATCHABLE_SECTIONS = ("experience", "education")
+
+class PatchError(ValueError):
+    """Raised when a patch cannot be applied to the document"""
+
+def merge_patch(target, patch):
+    """Apply an RFC 7396 merge patch: objects merge recursively, null deletes a key, anything else replaces"""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+def diff_merge_patch(source: dict, target: dict) -> dict:
+    """Build the merge patch that turns `source` into `target`; keys set to null in `target` come out deleted"""
+    patch = {key: None for key in source if key not in target}
+    for key, value in target.items():
+        if key not in source:
+            patch[key] = copy.deepcopy(value)
+        elif isinstance(value, dict) and isinstance(source[key], dict):
+            nested = diff_merge_patch(source[key], value)
+            if nested:
+                patch[key] = nested
+        elif value != source[key]:
+            patch[key] = copy.deepcopy(value)
+    return patch
+
+def apply_section_operation(data: dict, op: str, section: str, item_id: str, item: Optional[dict] = None):
+    """Upsert (merge into the matching entry, or append) or remove one section entry in place"""
+    if section not in PATCHABLE_SECTIONS:
+        raise PatchError(f"Unknown section: {section}")
+    entries = data.setdefault(section, [])
+    if not isinstance(entries, list):
+        raise PatchError(f"Section {section} is not a list")
+    if not all(isinstance(entry, dict) for entry in entries):
+        raise PatchError(f"Section {section} has entries that are not objects")
+    index = next((i for i, entry in enumerate(entries) if entry.get("id") == item_id), None)
+
+    if op == "remove":
+        # Removing an entry that is already gone is a no-op so retried autosaves stay idempotent
+        if index is not None:
+            del entries[index]
+    elif op == "upsert":
+        if not isinstance(item, dict):
+            raise PatchError("upsert needs an item object")
+        if index is None:
+            entries.append(merge_patch({}, {**item, "id": item_id}))
+        else:
+            entries[index] = merge_patch(entries[index], {**item, "id": item_id})
+    else:
+        raise PatchError(f"Unknown operation: {op}")
+
+def apply_resume_patch(
+    resume: dict,
+    title: Optional[str] = None,
+    template: Optional[str] = None,
+    data_patch: Optional[dict] = None,
+    operations: Optional[List[dict]] = None,
+) -> dict:
+    """Return a patched copy of a stored resume; merge-patch runs before the section operations"""
+    patched = dict(resume)
+    if title is not None:
+        patched["title"] = title
+    if template is not None:
+        patched["template"] = template
+
+    data = copy.deepcopy(resume["data"])
+    if data_patch is not None:
+        data = merge_patch(data, data_patch)
+    for operation in operations or []:
+        apply_section_operation(data, operation["op"], operation["section"], operation["id"], operation.get("item"))
+    patched["data"] = data
+    return patched
@@ -0,0 +1,200 @@
+"""
+Async Redis building blocks for resume documents: batched loading, the per-user
+listing index and compact listing summaries. Used by RedisStorage in database.py
+and by the render job workers.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from serialization import loads, queue_mget
+
+# Maximum number of keys per MGET; every chunk is sent in a single pipeline
+RESUME_FETCH_CHUNK_SIZE = int(os.getenv("RESUME_FETCH_CHUNK_SIZE", 100))
+
+def resume_index_key(user_id: str) -> str:
+    """Sorted set of a user's resume ids scored by updated_at"""
+    return f"user_resumes_by_updated:{user_id}"
+
+def updated_at_score(resume: dict) -> float:
+    """Convert a resume's stored updated_at (naive UTC ISO string) into a sort score"""
+    updated_at = datetime.fromisoformat(resume["updated_at"])
+    return updated_at.replace(tzinfo=timezone.utc).timestamp()
+
+def resume_summary_key(resume_id: str) -> str:
+    """Hash holding the compact listing fields of a resume"""
+    return f"resume_summary:{resume_id}"
+
+def build_summary(resume: dict) -> dict:
+    """Extract the listing fields of a resume document"""
+    return {
+        "id": resume["id"],
+        "user_id": resume["user_id"],
+        "title": resume["title"],
+        "template": resume.get("template", "modern"),
+        "status": resume.get("status", "draft"),
+        # Resumes written before revisions existed count as revision 0
+        "revision": resume.get("revision", 0),
+        "created_at": resume["created_at"],
+        "updated_at": resume["updated_at"],
+    }
+
+def store_summary(pipe, resume: dict) -> dict:
+    """Queue a write of the summary hash of a resume"""
+    summary = build_summary(resume)
+    pipe.hset(resume_summary_key(resume["id"]), mapping=summary)
+    return summary
+
+def index_resume(pipe, resume: dict):
+    """Queue commands adding or moving a resume in its owner's sorted index and refresh its summary"""
+    pipe.zadd(resume_index_key(resume["user_id"]), {resume["id"]: updated_at_score(resume)})
+    store_summary(pipe, resume)
+
+def unindex_resume(pipe, user_id: str, resume_id: str):
+    """Queue commands removing a resume from its owner's sorted index and drop its summary"""
+    pipe.zrem(resume_index_key(user_id), resume_id)
+    pipe.delete(resume_summary_key(resume_id))
+
+def encode_cursor(score: float, resume_id: str) -> str:
+    return f"{score!r}:{resume_id}"
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """Parse a listing cursor, raising ValueError when it is malformed"""
+    score, sep, resume_id = cursor.partition(":")
+    if not sep or not resume_id:
+        raise ValueError("Invalid cursor")
+    return float(score), resume_id
+
+async def fetch_resumes(client, resume_ids: Iterable[str], chunk_size: int = None) -> Tuple[List[dict], List[str]]:
+    """Load resume documents with chunked MGETs in one round trip, returning (resumes, missing_ids)"""
+    resume_ids = list(resume_ids)
+    if not resume_ids:
+        return [], []
+
+    chunk_size = max(1, chunk_size or RESUME_FETCH_CHUNK_SIZE)
+    pipe = client.pipeline(transaction=False)
+    for start in range(0, len(resume_ids), chunk_size):
+        chunk = resume_ids[start:start + chunk_size]
+        queue_mget(pipe, [f"resume:{resume_id}" for resume_id in chunk])
+
+    values = [value for chunk in await pipe.execute() for value in chunk]
+
+    resumes = []
+    missing = []
+    for resume_id, resume_data in zip(resume_ids, values):
+        if resume_data is None:
+            missing.append(resume_id)
+        else:
+            resumes.append(loads(resume_data))
+    return resumes, missing
+
+async def ensure_resume_index(client, user_id: str, chunk_size: int = None):
+    """Backfill the sorted index from the legacy user_resumes set for resumes created before it existed"""
+    user_resumes_key = f"user_resumes:{user_id}"
+    index_key = resume_index_key(user_id)
+
+    pipe = client.pipeline(transaction=False)
+    pipe.scard(user_resumes_key)
+    pipe.zcard(index_key)
+    total, indexed = await pipe.execute()
+    if indexed >= total:
+        return
+
+    unindexed = await client.smembers(user_resumes_key) - set(await client.zrange(index_key, 0, -1))
+    resumes, missing = await fetch_resumes(client, unindexed, chunk_size)
+
+    pipe = client.pipeline(transaction=False)
+    for resume in resumes:
+        index_resume(pipe, resume)
+    if missing:
+        pipe.srem(user_resumes_key, *missing)
+    await pipe.execute()
+
+async def load_index_page(
+    client,
+    user_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    chunk_size: int = None,
+) -> Tuple[List[Tuple[str, float]], Optional[str]]:
+    """Read one page of the sorted index, returning ([(resume_id, score)], next_cursor)"""
+    await ensure_resume_index(client, user_id, chunk_size)
+    index_key = resume_index_key(user_id)
+
+    # Fetch one entry past the page to know whether another page exists
+    if cursor is None:
+        stop = -1 if limit is None else limit
+        entries = await client.zrevrange(index_key, 0, stop, withscores=True)
+    else:
+        score, last_id = decode_cursor(cursor)
+        # Members sharing the cursor's score come back in reverse lexical order
+        ties = await client.zcount(index_key, score, score)
+        if limit is None:
+            entries = await client.zrevrangebyscore(index_key, score, "-inf", withscores=True)
+        else:
+            entries = await client.zrevrangebyscore(
+                index_key, score, "-inf", start=0, num=limit + ties + 1, withscores=True
+            )
+        entries = [(member, member_score) for member, member_score in entries
+                   if member_score < score or member < last_id]
+
+    page = entries if limit is None else entries[:limit]
+    next_cursor = None
+    if limit is not None and len(entries) > limit:
+        last_member, last_score = page[-1]
+        next_cursor = encode_cursor(last_score, last_member)
+
+    return page, next_cursor
+
+async def _prune_dangling(client, user_id: str, missing: List[str]):
+    """Drop ids whose documents are gone so later listings don't keep paying for them"""
+    if not missing:
+        return
+    pipe = client.pipeline(transaction=False)
+    pipe.srem(f"user_resumes:{user_id}", *missing)
+    pipe.zrem(resume_index_key(user_id), *missing)
+    pipe.delete(*[resume_summary_key(resume_id) for resume_id in missing])
+    await pipe.execute()
+
+async def load_resumes(client, user_id: str, resume_ids: List[str], chunk_size: int = None) -> List[dict]:
+    """Load the documents of an index page, in page order"""
+    resumes, missing = await fetch_resumes(client, resume_ids, chunk_size)
+    await _prune_dangling(client, user_id, missing)
+    return resumes
+
+async def load_summaries(client, user_id: str, resume_ids: List[str], chunk_size: int = None) -> List[dict]:
+    """Load the summaries of an index page without reading the full documents, in page order"""
+    pipe = client.pipeline(transaction=False)
+    for resume_id in resume_ids:
+        pipe.hgetall(resume_summary_key(resume_id))
+    summaries = dict(zip(resume_ids, await pipe.execute()))
+
+    # Resumes written before summaries existed fall back to their document once
+    unsummarized = [resume_id for resume_id, summary in summaries.items() if not summary]
+    if unsummarized:
+        resumes, missing = await fetch_resumes(client, unsummarized, chunk_size)
+        pipe = client.pipeline(transaction=False)
+        for resume in resumes:
+            summaries[resume["id"]] = store_summary(pipe, resume)
+        await pipe.execute()
+        await _prune_dangling(client, user_id, missing)
+
+    return [summaries[resume_id] for resume_id in resume_ids if summaries[resume_id]]
+
+async def load_resume_page(
+    client,
+    user_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    chunk_size: int = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Load one page of a user's resumes, newest first, returning (resumes, next_cursor)"""
+    entries, next_cursor = await load_index_page(client, user_id, limit, cursor, chunk_size)
+    resume_ids = [resume_id for resume_id, _ in entries]
+    return await load_resumes(client, user_id, resume_ids, chunk_size), next_cursor
+
+async def load_user_resumes(client, user_id: str, chunk_size: int = None) -> List[dict]:
+    """Load all resumes of a user, newest first"""
+    resumes, _ = await load_resume_page(client, user_id, chunk_size=chunk_size)
+    return resumes
@@ -0,0 +1,131 @@
+"""
+Inverted index for resume search. A resume is reduced to weighted terms
+drawn from its skills, experience and education; every user has one Redis
+sorted set per term (resume id -> weight), and every resume remembers the
+terms it was indexed under so updates and deletes can retract them. A query
+only reads the caller's postings for the query terms, so its cost does not
+grow with the total number of stored resumes.
+"""
+
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from resume_store import load_user_resumes
+
+# Letters and digits, keeping the "+", "#" and inner "." of terms like c++, c# and node.js
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from has have in into is it its of on or our
+    that the their to was were will with we i my me us via per
+""".split())
+
+# How much one occurrence of a term counts, by the field it appears in
+SEARCH_FIELD_WEIGHTS = {
+    "skills": 3.0,
+    "position": 2.0,
+    "company": 2.0,
+    "school": 1.5,
+    "field": 1.5,
+    "description": 1.0,
+}
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase a text and split it into terms, dropping stop words"""
+    terms = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        token = token.rstrip(".")
+        if token and token not in STOP_WORDS:
+            terms.append(token)
+    return terms
+
+def resume_fields(resume: dict) -> Iterable[Tuple[str, str]]:
+    """Yield the (field, text) pairs of a resume that are searchable"""
+    data = resume.get("data") or {}
+    for skill in data.get("skills") or []:
+        yield "skills", skill
+    for entry in data.get("experience") or []:
+        for field in ("company", "position", "description"):
+            yield field, entry.get(field) or ""
+    for entry in data.get("education") or []:
+        for field in ("school", "field"):
+            yield field, entry.get(field) or ""
+
+def resume_terms(resume: dict) -> Dict[str, float]:
+    """Weighted terms of a resume; repeated mentions count with diminishing returns"""
+    totals = defaultdict(float)
+    for field, text in resume_fields(resume):
+        for term in tokenize(text):
+            totals[term] += SEARCH_FIELD_WEIGHTS[field]
+    return {term: round(1 + math.log(total), 4) for term, total in totals.items()}
+
+def search_postings_key(user_id: str, term: str) -> str:
+    """Sorted set of a user's resume ids containing a term, scored by term weight"""
+    return f"search:{user_id}:{term}"
+
+def search_terms_key(resume_id: str) -> str:
+    """Set of the terms a resume is currently indexed under"""
+    return f"search_terms:{resume_id}"
+
+def search_indexed_key(user_id: str) -> str:
+    """Marker set once a user's resumes written before the index existed were backfilled"""
+    return f"search_indexed:{user_id}"
+
+def queue_index_terms(pipe, user_id: str, resume_id: str, terms: Dict[str, float], old_terms: Iterable[str] = ()):
+    """Queue commands replacing a resume's postings, retracting terms it no longer contains"""
+    for term in set(old_terms) - set(terms):
+        pipe.zrem(search_postings_key(user_id, term), resume_id)
+    for term, weight in terms.items():
+        pipe.zadd(search_postings_key(user_id, term), {resume_id: weight})
+    pipe.delete(search_terms_key(resume_id))
+    if terms:
+        pipe.sadd(search_terms_key(resume_id), *terms)
+
+def queue_unindex_terms(pipe, user_id: str, resume_id: str, old_terms: Iterable[str]):
+    """Queue commands removing a resume from all its postings"""
+    for term in old_terms:
+        pipe.zrem(search_postings_key(user_id, term), resume_id)
+    pipe.delete(search_terms_key(resume_id))
+
+def rank_matches(query_terms: List[str], postings: List[Dict[str, float]], limit: int) -> List[Tuple[str, float, List[str]]]:
+    """Rank resumes by how many query terms they contain, then by summed term weight"""
+    scores = defaultdict(float)
+    matched = defaultdict(list)
+    for term, posting in zip(query_terms, postings):
+        for resume_id, weight in posting.items():
+            scores[resume_id] += weight
+            matched[resume_id].append(term)
+
+    ranked = sorted(scores, key=lambda resume_id: (len(matched[resume_id]), scores[resume_id], resume_id), reverse=True)
+    return [(resume_id, round(scores[resume_id], 4), matched[resume_id]) for resume_id in ranked[:limit]]
+
+def query_terms(query: str) -> List[str]:
+    """Distinct terms of a search query, in query order"""
+    return list(dict.fromkeys(tokenize(query)))
+
+async def read_postings(client, user_id: str, terms: List[str]) -> List[Dict[str, float]]:
+    """Read a user's postings for several terms in one round trip"""
+    pipe = client.pipeline(transaction=False)
+    for term in terms:
+        pipe.zrange(search_postings_key(user_id, term), 0, -1, withscores=True)
+    return [dict(posting) for posting in await pipe.execute()]
+
+async def ensure_search_index(client, user_id: str):
+    """Index a user's resumes written before search existed, once"""
+    if await client.exists(search_indexed_key(user_id)):
+        return
+
+    resumes = await load_user_resumes(client, user_id)
+    pipe = client.pipeline(transaction=False)
+    for resume in resumes:
+        pipe.exists(search_terms_key(resume["id"]))
+    indexed = await pipe.execute()
+
+    pipe = client.pipeline(transaction=False)
+    for resume, is_indexed in zip(resumes, indexed):
+        if not is_indexed:
+            queue_index_terms(pipe, user_id, resume["id"], resume_terms(resume))
+    pipe.set(search_indexed_key(user_id), 1)
+    await pipe.execute()
@@ -0,0 +1,234 @@
+"""
+Pluggable serializer for documents stored in Redis (users and resumes).
+New records are written with the backend picked by RESUME_SERIALIZER and,
+above a size threshold, compressed with RESUME_COMPRESSION. Reads detect
+the format from the payload itself, so records written by an earlier
+backend or codec (including plain stdlib-JSON ones) stay readable while the
+data migrates lazily on its next write.
+"""
+
+import json
+import os
+import threading
+import zlib
+from typing import Any, Optional, Union
+
+import orjson
+from redis.client import NEVER_DECODE
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Backend used for new writes: "orjson" (default), "msgpack" or "json"
+RESUME_SERIALIZER = os.getenv("RESUME_SERIALIZER", "orjson")
+
+# Compression for new writes: "zlib" (default), "zstd" (needs the zstandard package) or "none"
+RESUME_COMPRESSION = os.getenv("RESUME_COMPRESSION", "zlib")
+RESUME_COMPRESSION_LEVEL = int(os.getenv("RESUME_COMPRESSION_LEVEL", 6))
+
+# Records smaller than this are stored uncompressed; framing overhead would eat the gain
+RESUME_COMPRESSION_MIN_BYTES = int(os.getenv("RESUME_COMPRESSION_MIN_BYTES", 256))
+
+# Compressed records start with this marker, a codec byte and a dictionary version byte
+COMPRESSED_MAGIC = b"\x00R"
+CODEC_ZLIB = b"Z"
+CODEC_ZSTD = b"S"
+
+# Preset dictionaries of strings that recur in every resume, so even a single
+# record compresses well. Records name the version they were written with:
+# never edit a published dictionary, add a new version instead.
+COMPRESSION_DICTIONARIES = {
+    1: "".join([
+        "Developed and maintained Implemented Designed Built Led a team of engineers ",
+        "Collaborated with cross-functional teams to improve performance scalability ",
+        "reducing latency by increasing using React TypeScript Python JavaScript Node.js ",
+        "AWS Docker Kubernetes SQL PostgreSQL Redis REST APIs microservices CI/CD ",
+        "Responsible for managing customers stakeholders product requirements ",
+        "University Bachelor of Science Master of Computer Science Engineering Business ",
+        "Software Engineer Senior Developer Intern Manager Analyst Present ",
+        "https://www.linkedin.com/in/https://github.com/@gmail.com",
+        '"gpa":null,"description":"","current":false,"current":true,',
+        '"website":null,"linkedin":null,"github":null},',
+        '{"id":"user_","full_name":"","email":"","hashed_password":"$2b$12$","resumes":[]',
+        '"status":"draft","template":"modern","revision":1,',
+        '"created_at":"2025-","updated_at":"2025-","user_id":"user_',
+        '"education":[{"id":"","school":"","degree":"","field":"","startDate":"","endDate":"',
+        '"experience":[{"id":"","company":"","position":"","startDate":"","endDate":"',
+        '"skills":["',
+        '{"id":"","title":"","template":"modern","data":{"personalDetails":{"fullName":"","email":"","phone":"","location":"',
+    ]).encode("utf-8"),
+}
+COMPRESSION_DICTIONARY_VERSION = max(COMPRESSION_DICTIONARIES)
+
+# Stored documents are always objects, so a JSON record starts with "{"; msgpack maps never do
+JSON_PREFIX = b"{"
+
+# Read a reply as raw bytes even on a client created with decode_responses=True
+RAW_REPLY = {NEVER_DECODE: True}
+
+class JsonSerializer:
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+class OrjsonSerializer:
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+class MsgpackSerializer:
+    name = "msgpack"
+
+    def dumps(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+SERIALIZERS = {
+    "json": JsonSerializer,
+    "orjson": OrjsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+def get_serializer(name: str = RESUME_SERIALIZER):
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer: {name}")
+    if name == "msgpack" and msgpack is None:
+        raise ValueError("The msgpack serializer needs the msgpack package")
+    return SERIALIZERS[name]()
+
+class ZlibCodec:
+    code = CODEC_ZLIB
+
+    def compress(self, data: bytes, version: int) -> bytes:
+        compressor = zlib.compressobj(RESUME_COMPRESSION_LEVEL, zdict=COMPRESSION_DICTIONARIES[version])
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes, version: int) -> bytes:
+        decompressor = zlib.decompressobj(zdict=COMPRESSION_DICTIONARIES[version])
+        return decompressor.decompress(data) + decompressor.flush()
+
+class ZstdCodec:
+    code = CODEC_ZSTD
+
+    def __init__(self):
+        self._dictionaries = {
+            version: zstandard.ZstdCompressionDict(raw, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            for version, raw in COMPRESSION_DICTIONARIES.items()
+        }
+
+    def compress(self, data: bytes, version: int) -> bytes:
+        compressor = zstandard.ZstdCompressor(level=RESUME_COMPRESSION_LEVEL, dict_data=self._dictionaries[version])
+        return compressor.compress(data)
+
+    def decompress(self, data: bytes, version: int) -> bytes:
+        return zstandard.ZstdDecompressor(dict_data=self._dictionaries[version]).decompress(data)
+
+def get_codec(name: str = RESUME_COMPRESSION):
+    """Codec for new writes, or None when compression is off"""
+    if name == "none":
+        return None
+    if name == "zlib":
+        return ZlibCodec()
+    if name == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        return ZstdCodec()
+    raise ValueError(f"Unknown compression: {name}")
+
+serializer = get_serializer()
+codec = get_codec()
+
+# Readers handle every codec a record may have been written with, whatever is configured now
+_decoders = {CODEC_ZLIB: ZlibCodec()}
+if zstandard is not None:
+    _decoders[CODEC_ZSTD] = codec if isinstance(codec, ZstdCodec) else ZstdCodec()
+
+class CompressionStats:
+    """Running totals of what this process wrote, to judge the compression ratio"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = 0
+        self._compressed = 0
+        self._raw_bytes = 0
+        self._stored_bytes = 0
+
+    def record(self, raw_size: int, stored_size: int, compressed: bool):
+        with self._lock:
+            self._records += 1
+            self._compressed += int(compressed)
+            self._raw_bytes += raw_size
+            self._stored_bytes += stored_size
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "serializer": serializer.name,
+                "compression": RESUME_COMPRESSION,
+                "records_written": self._records,
+                "records_compressed": self._compressed,
+                "raw_bytes": self._raw_bytes,
+                "stored_bytes": self._stored_bytes,
+                "compression_ratio": round(self._raw_bytes / self._stored_bytes, 2) if self._stored_bytes else None,
+            }
+
+compression_stats = CompressionStats()
+
+def dumps(obj: Any) -> bytes:
+    """Encode a document with the configured backend, compressing it when that pays off"""
+    data = serializer.dumps(obj)
+    if codec is None or len(data) < RESUME_COMPRESSION_MIN_BYTES:
+        compression_stats.record(len(data), len(data), False)
+        return data
+
+    version = COMPRESSION_DICTIONARY_VERSION
+    stored = COMPRESSED_MAGIC + codec.code + bytes([version]) + codec.compress(data, version)
+    if len(stored) >= len(data):
+        compression_stats.record(len(data), len(data), False)
+        return data
+    compression_stats.record(len(data), len(stored), True)
+    return stored
+
+def _decompress(data: bytes) -> bytes:
+    code, version = data[2:3], data[3]
+    decoder = _decoders.get(code)
+    if decoder is None:
+        raise ValueError("Found a zstd-compressed record but the zstandard package is not installed")
+    if version not in COMPRESSION_DICTIONARIES:
+        raise ValueError(f"Unknown compression dictionary version: {version}")
+    return decoder.decompress(data[4:], version)
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a stored document written by any backend or codec"""
+    if not isinstance(data, str) and data[:2] == COMPRESSED_MAGIC:
+        data = _decompress(data)
+    if isinstance(data, str) or data[:1] == JSON_PREFIX:
+        # orjson parses stdlib-JSON records too, just faster
+        return orjson.loads(data)
+    if msgpack is None:
+        raise ValueError("Found a msgpack record but the msgpack package is not installed")
+    return msgpack.unpackb(data, raw=False)
+
+async def read_record(client, key: str) -> Optional[Any]:
+    """GET and decode a stored document; also works on a pipeline in WATCH mode"""
+    data = await client.execute_command("GET", key, **RAW_REPLY)
+    return loads(data) if data is not None else None
+
+async def read_records(client, keys) -> list:
+    """MGET and decode several stored documents, with None for missing keys"""
+    if not keys:
+        return []
+    values = await client.execute_command("MGET", *keys, **RAW_REPLY)
+    return [loads(data) if data is not None else None for data in values]
+
+def queue_mget(pipe, keys) -> None:
+    """Queue an MGET whose reply keeps the raw stored bytes for loads()"""
+    pipe.execute_command("MGET", *keys, **RAW_REPLY)
@@ -0,0 +1,77 @@
+"""
+Script to bulk import resumes from a JSON Lines file into a user's account
+Each line holds one resume in the POST /resume format ({"title", "template", "data"})
+
+Usage: python scripts/import_resumes.py resumes.jsonl --email owner@example.com
+       cat resumes.jsonl | python scripts/import_resumes.py - --email owner@example.com
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import argparse
+import asyncio
+from backend.bulk_import import IMPORT_BATCH_SIZE, import_resume_lines
+from backend.database import create_storage
+from backend.main import build_imported_resume
+
+# Bytes read from the input per chunk
+READ_CHUNK_SIZE = 64 * 1024
+
+async def read_chunks(stream):
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+async def _import_resumes(path: str, email: str, batch_size: int) -> bool:
+    storage = create_storage()
+    if not await storage.connect(max_connections=2):
+        print("❌ Storage is not connected. Please start Redis server first.")
+        return False
+
+    try:
+        user = await storage.get_user_by_email(email)
+        if not user:
+            print(f"❌ No user with email {email}")
+            return False
+
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        try:
+            report = await import_resume_lines(
+                read_chunks(stream),
+                lambda record: build_imported_resume(record, user["id"]),
+                storage,
+                batch_size=batch_size
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        print(f"✅ Imported {report.imported} resumes for {email}")
+        if report.failed:
+            print(f"⚠️  {report.failed} lines failed:")
+            for error in report.errors:
+                print(f"   line {error['line']}: {error['error']}")
+            if report.failed > len(report.errors):
+                print(f"   ... and {report.failed - len(report.errors)} more")
+        return report.failed == 0
+
+    finally:
+        await storage.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import resumes from a JSON Lines file")
+    parser.add_argument("path", help="JSON Lines file, or - to read standard input")
+    parser.add_argument("--email", required=True, help="Email of the user who will own the resumes")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Resumes written per round trip")
+    args = parser.parse_args()
+
+    print("🚀 Importing resumes...")
+    success = asyncio.run(_import_resumes(args.path, args.email, args.batch_size))
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
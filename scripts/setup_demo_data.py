@@ -1,43 +1,169 @@
-import json
-import redis
-from datetime import datetime
+"""
+Script to set up demo data for the resume platform: the demo user with two
+sample resumes and, optionally, synthetic users and resumes for load testing
+
+Usage: python scripts/setup_demo_data.py
+       python scripts/setup_demo_data.py --users 1000 --resumes-per-user 20 --seed 7
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import argparse
+import asyncio
+import random
+import time
 import uuid
-from passlib.context import CryptContext
+from datetime import datetime, timedelta
+from backend.auth import get_password_hash
+from backend.database import create_storage
+
+DEMO_EMAIL = "hire-me@anshumat.org"
+DEMO_PASSWORD = "HireMe@2025!"
+
+# Generated timestamps are offsets from a fixed date so a seed always yields the same data
+GENERATED_DATA_EPOCH = datetime(2025, 1, 1)
+
+COMPANIES = [
+    "Tech Innovations Inc.", "StartupXYZ", "Product Solutions Corp", "Innovation Labs", "Globex",
+    "Initech", "Umbrella Analytics", "Stark Industries", "Wayne Enterprises", "Acme Cloud",
+    "Hooli", "Pied Piper", "Vandelay Industries", "Cyberdyne Systems", "Soylent Foods",
+    "Massive Dynamic", "Aperture Science", "Blue Sun Logistics", "Oscorp", "Tyrell Corporation",
+]
+POSITIONS = [
+    "Software Engineer", "Senior Software Engineer", "Staff Engineer", "Full Stack Developer",
+    "Backend Engineer", "Frontend Engineer", "Data Scientist", "Data Engineer", "DevOps Engineer",
+    "Site Reliability Engineer", "Product Manager", "Senior Product Manager", "UX Designer",
+    "Engineering Manager", "QA Engineer", "Mobile Developer", "Machine Learning Engineer",
+]
+SKILLS = [
+    "JavaScript", "TypeScript", "React", "Node.js", "Python", "Django", "FastAPI", "Go", "Rust",
+    "Java", "Kotlin", "Swift", "C++", "C#", "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis",
+    "Kafka", "AWS", "GCP", "Azure", "Docker", "Kubernetes", "Terraform", "Git", "GraphQL",
+    "REST APIs", "Microservices", "CI/CD", "Linux", "Pandas", "TensorFlow", "PyTorch", "Spark",
+    "Figma", "Agile/Scrum", "A/B Testing", "Product Strategy", "User Research", "Data Analysis",
+    "Roadmap Planning", "Stakeholder Management", "Next.js", "Vue.js", "Tailwind CSS", "Elasticsearch",
+]
+SCHOOLS = [
+    "University of California, Berkeley", "Stanford University", "MIT", "Carnegie Mellon University",
+    "University of Washington", "Georgia Institute of Technology", "University of Texas at Austin",
+    "University of Michigan", "IIT Bombay", "University of Toronto", "ETH Zurich", "NUS",
+]
+DEGREES = ["Bachelor of Science", "Bachelor of Engineering", "Master of Science", "Master of Business Administration", "PhD"]
+FIELDS = ["Computer Science", "Software Engineering", "Electrical Engineering", "Mathematics", "Statistics", "Technology Management", "Design"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Seattle, WA", "Austin, TX", "Boston, MA", "Remote", "London, UK", "Bangalore, India"]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn", "Priya", "Wei", "Diego", "Amara"]
+LAST_NAMES = ["Smith", "Johnson", "Lee", "Garcia", "Patel", "Kim", "Nguyen", "Brown", "Martinez", "Chen", "Okafor", "Silva"]
+
+VERBS = ["Led", "Built", "Designed", "Implemented", "Migrated", "Optimized", "Owned", "Launched", "Scaled", "Automated"]
+OBJECTS = [
+    "a customer-facing web application", "the payments platform", "internal developer tooling",
+    "the data ingestion pipeline", "a recommendation service", "the mobile checkout flow",
+    "the observability stack", "a multi-tenant SaaS backend", "the search infrastructure",
+]
+OUTCOMES = [
+    "reducing latency by {n}%", "increasing conversion by {n}%", "cutting infrastructure costs by {n}%",
+    "serving {n}0,000+ daily users", "improving test coverage to {n}%", "shortening release cycles by {n}%",
+]
+
+# Size distributions: (value, weight) pairs roughly following real resumes
+EXPERIENCE_COUNTS = [(1, 15), (2, 30), (3, 25), (4, 15), (5, 8), (6, 4), (8, 3)]
+EDUCATION_COUNTS = [(1, 70), (2, 25), (3, 5)]
+
+def weighted_choice(rng: random.Random, distribution):
+    values, weights = zip(*distribution)
+    return rng.choices(values, weights=weights)[0]
 
-# Initialize password context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def generated_uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+def generate_description(rng: random.Random) -> str:
+    # Lognormal sentence counts: most descriptions are short, a few run long
+    sentences = max(1, min(12, int(rng.lognormvariate(1.0, 0.6))))
+    return " ".join(
+        f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, "
+        f"{rng.choice(OUTCOMES).format(n=rng.randint(10, 90))}."
+        for _ in range(sentences)
+    )
 
-# Connect to Redis
-try:
-    redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
-    redis_client.ping()
-    print("✅ Connected to Redis successfully")
-except redis.ConnectionError:
-    print("❌ Failed to connect to Redis. Make sure Redis is running.")
-    exit(1)
+def generate_resume(rng: random.Random, user: dict) -> dict:
+    """Build one stored resume with randomized section sizes"""
+    experience = []
+    end = GENERATED_DATA_EPOCH - timedelta(days=rng.randint(0, 365))
+    for index in range(weighted_choice(rng, EXPERIENCE_COUNTS)):
+        start = end - timedelta(days=rng.randint(180, 1500))
+        experience.append({
+            "id": generated_uuid(rng),
+            "company": rng.choice(COMPANIES),
+            "position": rng.choice(POSITIONS),
+            "startDate": start.strftime("%Y-%m"),
+            "endDate": end.strftime("%Y-%m"),
+            "current": index == 0 and rng.random() < 0.6,
+            "description": generate_description(rng),
+        })
+        end = start - timedelta(days=rng.randint(0, 120))
 
-def create_demo_user():
+    education = []
+    for _ in range(weighted_choice(rng, EDUCATION_COUNTS)):
+        start = end - timedelta(days=rng.randint(700, 1500))
+        education.append({
+            "id": generated_uuid(rng),
+            "school": rng.choice(SCHOOLS),
+            "degree": rng.choice(DEGREES),
+            "field": rng.choice(FIELDS),
+            "startDate": start.strftime("%Y-%m"),
+            "endDate": end.strftime("%Y-%m"),
+            "gpa": f"{rng.uniform(2.8, 4.0):.1f}" if rng.random() < 0.5 else None,
+            "description": None,
+        })
+        end = start
+
+    created_at = GENERATED_DATA_EPOCH - timedelta(seconds=rng.randint(0, 730 * 86400))
+    updated_at = created_at + timedelta(seconds=rng.randint(0, 90 * 86400))
+    position = experience[0]["position"]
+    return {
+        "id": generated_uuid(rng),
+        "user_id": user["id"],
+        "title": f"{position} Resume",
+        "template": "modern",
+        "data": {
+            "personalDetails": {
+                "fullName": user["full_name"],
+                "email": user["email"],
+                "phone": f"+1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                "location": rng.choice(LOCATIONS),
+                "website": None,
+                "linkedin": f"https://linkedin.com/in/{user['id']}" if rng.random() < 0.7 else None,
+                "github": f"https://github.com/{user['id']}" if rng.random() < 0.5 else None,
+            },
+            "experience": experience,
+            "education": education,
+            "skills": rng.sample(SKILLS, max(3, min(len(SKILLS), int(rng.gauss(12, 5))))),
+        },
+        "created_at": created_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
+        "revision": 1,
+    }
+
+async def create_demo_user(storage):
     """Create the required demo user with credentials"""
     demo_user_data = {
         "id": "demo_user_001",
         "full_name": "Demo User",
-        "email": "hire-me@anshumat.org",
-        "hashed_password": get_password_hash("HireMe@2025!"),
+        "email": DEMO_EMAIL,
+        "hashed_password": get_password_hash(DEMO_PASSWORD),
         "created_at": datetime.utcnow().isoformat(),
         "resumes": []
     }
     
-    user_key = f"user:{demo_user_data['email']}"
-    redis_client.set(user_key, json.dumps(demo_user_data))
+    await storage.create_user(demo_user_data)
     print("✅ Demo user created successfully")
-    print("📧 Email: hire-me@anshumat.org")
-    print("🔑 Password: HireMe@2025!")
+    print(f"📧 Email: {DEMO_EMAIL}")
+    print(f"🔑 Password: {DEMO_PASSWORD}")
     return demo_user_data
 
-def create_sample_resumes(user_id):
+async def create_sample_resumes(storage, user_id):
     """Create sample resumes for the demo user"""
     
     # Sample Resume 1: Software Engineer
@@ -148,48 +274,75 @@ def create_sample_resumes(user_id):
     
     # Create resumes in database
     resumes = [resume1_data, resume2_data]
-    created_resumes = []
     
     for resume_data in resumes:
-        resume_id = str(uuid.uuid4())
-        resume_data["id"] = resume_id
+        resume_data["id"] = str(uuid.uuid4())
         resume_data["user_id"] = user_id
         resume_data["created_at"] = datetime.utcnow().isoformat()
         resume_data["updated_at"] = datetime.utcnow().isoformat()
-        
-        # Store resume
-        resume_key = f"resume:{resume_id}"
-        redis_client.set(resume_key, json.dumps(resume_data))
-        
-        # Add to user's resume list
-        user_resumes_key = f"user_resumes:{user_id}"
-        redis_client.sadd(user_resumes_key, resume_id)
-        
-        created_resumes.append(resume_data)
+        resume_data["revision"] = 1
+    
+    # One batch writes the documents together with their listing and search indexes
+    await storage.create_resumes(resumes)
+    for resume_data in resumes:
         print(f"✅ Created sample resume: {resume_data['title']}")
     
-    return created_resumes
+    return resumes
 
-def verify_setup():
+async def seed_load_data(storage, users: int, resumes_per_user: int, seed: int, batch_size: int, password: str):
+    """Create users x resumes of synthetic data in pipelined batches"""
+    rng = random.Random(seed)
+    # bcrypt is deliberately slow, so every generated user shares one hash
+    hashed_password = get_password_hash(password)
+    
+    started_at = time.monotonic()
+    user_batch = []
+    resume_batch = []
+    written = 0
+    for index in range(users):
+        user = {
+            "id": f"load_user_{index:06d}",
+            "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "email": f"load-user-{index}@example.com",
+            "hashed_password": hashed_password,
+            "created_at": (GENERATED_DATA_EPOCH - timedelta(days=rng.randint(0, 730))).isoformat(),
+            "resumes": []
+        }
+        user_batch.append(user)
+        resume_batch.extend(generate_resume(rng, user) for _ in range(resumes_per_user))
+        
+        # Users and resumes are flushed together, each kind in one pipelined write
+        if len(resume_batch) >= batch_size or len(user_batch) >= batch_size:
+            await storage.save_users(user_batch)
+            await storage.create_resumes(resume_batch)
+            written += len(resume_batch)
+            user_batch, resume_batch = [], []
+            print(f"   ... {index + 1} users, {written} resumes written")
+    
+    if user_batch:
+        await storage.save_users(user_batch)
+        await storage.create_resumes(resume_batch)
+        written += len(resume_batch)
+    
+    elapsed = time.monotonic() - started_at
+    print(f"✅ Created {users} users and {written} resumes in {elapsed:.1f}s ({written / max(elapsed, 1e-9):.0f} resumes/s)")
+    print(f"🔑 Password for every load-test user: {password}")
+
+async def verify_setup(storage):
     """Verify that everything is set up correctly"""
     print("\n🔍 Verifying setup...")
     
     # Check if demo user exists
-    user_data = redis_client.get("user:hire-me@anshumat.org")
-    if user_data:
-        user = json.loads(user_data)
+    user = await storage.get_user_by_email(DEMO_EMAIL)
+    if user:
         print(f"✅ Demo user found: {user['full_name']} ({user['email']})")
         
         # Check resumes
-        user_resumes_key = f"user_resumes:{user['id']}"
-        resume_ids = redis_client.smembers(user_resumes_key)
-        print(f"✅ Found {len(resume_ids)} sample resumes")
+        resumes = await storage.get_user_resumes(user['id'])
+        print(f"✅ Found {len(resumes)} sample resumes")
         
-        for resume_id in resume_ids:
-            resume_data = redis_client.get(f"resume:{resume_id}")
-            if resume_data:
-                resume = json.loads(resume_data)
-                print(f"   - {resume['title']}")
+        for resume in resumes:
+            print(f"   - {resume['title']}")
     else:
         print("❌ Demo user not found")
         return False
@@ -197,25 +350,53 @@ def verify_setup():
     print("\n🎉 Setup verification complete!")
     return True
 
+async def _setup(args):
+    storage = create_storage()
+    if not await storage.connect():
+        print("❌ Failed to connect to Redis. Make sure Redis is running.")
+        return False
+    
+    try:
+        if not args.skip_demo:
+            # Create demo user
+            demo_user = await create_demo_user(storage)
+            
+            # Create sample resumes
+            print("\n📄 Creating sample resumes...")
+            await create_sample_resumes(storage, demo_user["id"])
+            
+            # Verify setup
+            await verify_setup(storage)
+        
+        if args.users:
+            print(f"\n🏭 Generating {args.users} users x {args.resumes_per_user} resumes (seed {args.seed})...")
+            await seed_load_data(storage, args.users, args.resumes_per_user, args.seed, args.batch_size, args.password)
+        return True
+    finally:
+        await storage.close()
+
 def main():
+    parser = argparse.ArgumentParser(description="Set up demo data and synthetic load-test data")
+    parser.add_argument("--users", type=int, default=0, help="Synthetic users to generate (default: none)")
+    parser.add_argument("--resumes-per-user", type=int, default=10, help="Resumes generated per synthetic user")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed generates the same data")
+    parser.add_argument("--batch-size", type=int, default=500, help="Resumes written per pipelined batch")
+    parser.add_argument("--password", default="LoadTest@2025!", help="Password of every synthetic user")
+    parser.add_argument("--skip-demo", action="store_true", help="Only generate synthetic data")
+    args = parser.parse_args()
+    
     print("🚀 Setting up demo data for Resume Platform...")
     print("=" * 50)
     
-    # Create demo user
-    demo_user = create_demo_user()
-    
-    # Create sample resumes
-    print("\n📄 Creating sample resumes...")
-    create_sample_resumes(demo_user["id"])
-    
-    # Verify setup
-    verify_setup()
+    if not asyncio.run(_setup(args)):
+        sys.exit(1)
     
     print("\n" + "=" * 50)
     print("✅ Demo setup complete!")
-    print("\nDemo Login Credentials:")
-    print("📧 Email: hire-me@anshumat.org")
-    print("🔑 Password: HireMe@2025!")
+    if not args.skip_demo:
+        print("\nDemo Login Credentials:")
+        print(f"📧 Email: {DEMO_EMAIL}")
+        print(f"🔑 Password: {DEMO_PASSWORD}")
     print("\nYou can now:")
     print("1. Start the backend server: python scripts/backend/main.py")
     print("2. Start the frontend: npm run dev")
@@ -7,14 +7,13 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
+import asyncio
 from backend.database import db
 from backend.auth import get_password_hash
 from datetime import datetime
 
-def create_demo_user():
-    """Create the demo user as required by the assignment"""
-    
-    if not db.is_connected():
+async def _create_demo_user():
+    if not await db.connect(max_connections=1):
         print("❌ Redis is not connected. Please start Redis server first.")
         return False
     
@@ -29,7 +28,7 @@ def create_demo_user():
     
     try:
         # Check if demo user already exists
-        existing_user = db.get_user_by_email("hire-me@anshumat.org")
+        existing_user = await db.get_user_by_email("hire-me@anshumat.org")
         if existing_user:
             print("✅ Demo user already exists")
             print("📧 Email: hire-me@anshumat.org")
@@ -37,7 +36,7 @@ def create_demo_user():
             return True
         
         # Create the demo user
-        db.create_user(demo_user_data)
+        await db.create_user(demo_user_data)
         print("✅ Demo user created successfully!")
         print("📧 Email: hire-me@anshumat.org")
         print("🔑 Password: HireMe@2025!")
@@ -47,6 +46,12 @@ def create_demo_user():
     except Exception as e:
         print(f"❌ Failed to create demo user: {e}")
         return False
+    finally:
+        await db.close()
+
+def create_demo_user():
+    """Create the demo user as required by the assignment"""
+    return asyncio.run(_create_demo_user())
 
 if __name__ == "__main__":
     print("🚀 Setting up demo user for ResumeBuilder Pro...")
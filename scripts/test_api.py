@@ -1,5 +1,9 @@
 import requests
 import json
+import io
+import time
+import uuid
+import zipfile
 from datetime import datetime
 
 # API Configuration
@@ -7,6 +11,13 @@ API_BASE_URL = "http://localhost:8000"
 DEMO_EMAIL = "hire-me@anshumat.org"
 DEMO_PASSWORD = "HireMe@2025!"
 
+# A skill listed on the demo account's "Software Engineer Resume"; titles aren't indexed
+SEARCH_SKILL = "PostgreSQL"
+SEARCH_EXPECTED_TITLE = "Software Engineer Resume"
+
+# Seconds to wait for a render job to finish
+RENDER_JOB_POLL_TIMEOUT = 60
+
 class APITester:
     def __init__(self):
         self.token = None
@@ -102,6 +113,234 @@ class APITester:
             print(f"❌ PDF download error: {e}")
             return False
     
+    def test_patch_resume(self, resume):
+        """Test partial resume update with If-Match"""
+        print(f"🔍 Testing resume patch for '{resume['title']}'...")
+        try:
+            etag = f'"rev-{resume["revision"]}"'
+            response = self.session.patch(
+                f"{API_BASE_URL}/resume/{resume['id']}",
+                json={"title": f"{resume['title']} (patched)"},
+                headers={"If-Match": etag}
+            )
+            if response.status_code != 200 or response.json()["revision"] != resume["revision"] + 1:
+                print(f"❌ Resume patch failed: {response.status_code} - {response.text}")
+                return False
+            
+            # The resume has moved on, so the old ETag must be rejected
+            stale = self.session.patch(
+                f"{API_BASE_URL}/resume/{resume['id']}",
+                json={"title": "Stale write"},
+                headers={"If-Match": etag}
+            )
+            if stale.status_code != 412:
+                print(f"❌ Stale patch was not rejected: {stale.status_code}")
+                return False
+            
+            # Put the original title back
+            restored = self.session.patch(
+                f"{API_BASE_URL}/resume/{resume['id']}",
+                json={"title": resume["title"]},
+                headers={"If-Match": response.headers["ETag"]}
+            )
+            if restored.status_code != 200:
+                print(f"❌ Restoring the title failed: {restored.status_code}")
+                return False
+            print("✅ Resume patched and stale write rejected")
+            return True
+        except Exception as e:
+            print(f"❌ Resume patch error: {e}")
+            return False
+    
+    def test_resume_revisions(self, resume_id):
+        """Test resume revision history"""
+        print("🔍 Testing resume revisions...")
+        try:
+            response = self.session.get(f"{API_BASE_URL}/resume/{resume_id}/revisions")
+            if response.status_code != 200:
+                print(f"❌ Revision listing failed: {response.status_code}")
+                return False
+            revisions = response.json()
+            
+            for revision in revisions[1:2]:
+                old = self.session.get(f"{API_BASE_URL}/resume/{resume_id}/revisions/{revision['revision']}")
+                if old.status_code != 200:
+                    print(f"❌ Revision {revision['revision']} retrieval failed: {old.status_code}")
+                    return False
+            
+            missing = self.session.get(f"{API_BASE_URL}/resume/{resume_id}/revisions/999999")
+            if missing.status_code != 404:
+                print(f"❌ Unknown revision returned {missing.status_code}")
+                return False
+            print(f"✅ Retrieved {len(revisions)} revisions")
+            return True
+        except Exception as e:
+            print(f"❌ Revisions error: {e}")
+            return False
+    
+    def test_search_resumes(self, query, expected_title):
+        """Test full-text resume search"""
+        print(f"🔍 Testing resume search for '{query}'...")
+        try:
+            response = self.session.get(f"{API_BASE_URL}/resume/search", params={"q": query})
+            if response.status_code != 200:
+                print(f"❌ Resume search failed: {response.status_code}")
+                return False
+            results = response.json()
+            
+            # Matched terms come back normalized, so compare in lowercase
+            hit = next((result for result in results if result["title"] == expected_title), None)
+            if hit is None or query.lower() not in hit["matched_terms"]:
+                print(f"❌ '{expected_title}' was not found by '{query}': {results}")
+                return False
+            
+            empty = self.session.get(f"{API_BASE_URL}/resume/search", params={"q": ""})
+            if empty.status_code != 422:
+                print(f"❌ Empty search query returned {empty.status_code}")
+                return False
+            print(f"✅ Search returned {len(results)} resumes")
+            for result in results:
+                print(f"   - {result['title']} (score {result['score']})")
+            return True
+        except Exception as e:
+            print(f"❌ Resume search error: {e}")
+            return False
+    
+    def test_match_resumes(self):
+        """Test matching resumes against a job description"""
+        print("🔍 Testing job description matching...")
+        try:
+            response = self.session.post(
+                f"{API_BASE_URL}/resume/match",
+                json={"job_description": "Senior Python developer with React, AWS and PostgreSQL", "limit": 3}
+            )
+            if response.status_code != 200:
+                print(f"❌ Resume matching failed: {response.status_code}")
+                return False
+            matches = response.json()
+            
+            # Nothing but posting boilerplate leaves no keywords to match
+            empty = self.session.post(
+                f"{API_BASE_URL}/resume/match",
+                json={"job_description": "strong team experience"}
+            )
+            if empty.status_code != 400:
+                print(f"❌ Keyword-free job description returned {empty.status_code}")
+                return False
+            print(f"✅ Matched {len(matches)} resumes")
+            for match in matches:
+                print(f"   - {match['title']} (score {match['score']})")
+            return True
+        except Exception as e:
+            print(f"❌ Resume matching error: {e}")
+            return False
+    
+    def test_export_resumes(self, resume_ids):
+        """Test bulk ZIP export"""
+        print("🔍 Testing bulk export...")
+        try:
+            response = self.session.post(
+                f"{API_BASE_URL}/resume/export",
+                json={"resume_ids": resume_ids + ["missing-resume"]}
+            )
+            if response.status_code != 200:
+                print(f"❌ Bulk export failed: {response.status_code}")
+                return False
+            names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+            if len(names) != len(resume_ids) + 1 or "errors.txt" not in names:
+                print(f"❌ Unexpected export contents: {names}")
+                return False
+            
+            too_many = self.session.post(
+                f"{API_BASE_URL}/resume/export",
+                json={"resume_ids": [str(uuid.uuid4()) for _ in range(501)]}
+            )
+            if too_many.status_code != 400:
+                print(f"❌ Oversized export returned {too_many.status_code}")
+                return False
+            print(f"✅ Exported {len(resume_ids)} resumes: {', '.join(names)}")
+            return True
+        except Exception as e:
+            print(f"❌ Bulk export error: {e}")
+            return False
+    
+    def test_render_job(self, resume_id):
+        """Test background render jobs"""
+        print("🔍 Testing render job...")
+        try:
+            response = self.session.post(f"{API_BASE_URL}/render-jobs", json={"resume_ids": [resume_id]})
+            if response.status_code == 503:
+                print("⚠️  Render jobs need the Redis storage backend, skipping")
+                return True
+            if response.status_code != 202:
+                print(f"❌ Render job submission failed: {response.status_code}")
+                return False
+            job = response.json()
+            
+            deadline = time.time() + RENDER_JOB_POLL_TIMEOUT
+            while job["status"] in ("queued", "running") and time.time() < deadline:
+                time.sleep(1)
+                job = self.session.get(f"{API_BASE_URL}/render-jobs/{job['id']}").json()
+            if job["status"] != "completed":
+                print(f"❌ Render job ended as {job['status']}: {job['errors']}")
+                return False
+            
+            artifact = self.session.get(f"{API_BASE_URL}/render-jobs/{job['id']}/artifact")
+            if artifact.status_code != 200 or not artifact.content.startswith(b"%PDF"):
+                print(f"❌ Render job artifact download failed: {artifact.status_code}")
+                return False
+            
+            missing = self.session.get(f"{API_BASE_URL}/render-jobs/{uuid.uuid4()}")
+            if missing.status_code != 404:
+                print(f"❌ Unknown render job returned {missing.status_code}")
+                return False
+            print(f"✅ Render job completed ({len(artifact.content)} bytes)")
+            return True
+        except Exception as e:
+            print(f"❌ Render job error: {e}")
+            return False
+    
+    def test_import_resumes(self):
+        """Test NDJSON bulk import"""
+        print("🔍 Testing bulk import...")
+        title = f"API Test Import {datetime.now().strftime('%Y%m%d%H%M%S')}"
+        try:
+            resume = {
+                "title": title,
+                "data": {
+                    "personalDetails": {"fullName": "Import Test", "email": "import@example.com", "phone": "555-0100", "location": "Remote"},
+                    "education": [],
+                    "experience": [],
+                    "skills": ["Python"]
+                }
+            }
+            body = "\n".join([json.dumps(resume), "not json", json.dumps({"title": "No data"})]) + "\n"
+            response = self.session.post(
+                f"{API_BASE_URL}/resume/import",
+                data=body.encode("utf-8"),
+                headers={"Content-Type": "application/x-ndjson"}
+            )
+            if response.status_code != 200:
+                print(f"❌ Bulk import failed: {response.status_code}")
+                return False
+            report = response.json()
+            if report["imported"] != 1 or [error["line"] for error in report["errors"]] != [2, 3]:
+                print(f"❌ Unexpected import report: {report}")
+                return False
+            print(f"✅ Imported {report['imported']} resume, rejected {report['failed']} bad lines")
+            return True
+        except Exception as e:
+            print(f"❌ Bulk import error: {e}")
+            return False
+        finally:
+            # Remove the imported resume so repeated runs leave the demo account as it was
+            try:
+                for summary in self.session.get(f"{API_BASE_URL}/resume/summary").json():
+                    if summary["title"] == title:
+                        self.session.delete(f"{API_BASE_URL}/resume/{summary['id']}")
+            except Exception:
+                pass
+    
     def run_all_tests(self):
         """Run all API tests"""
         print("🚀 Starting API Tests...")
@@ -139,6 +378,41 @@ class APITester:
                 total_tests += 1
                 if self.test_pdf_download(resume['id'], resume['title']):
                     tests_passed += 1
+            
+            # Test 6: Partial Update
+            total_tests += 1
+            if self.test_patch_resume(resumes[0]):
+                tests_passed += 1
+            
+            # Test 7: Revision History
+            total_tests += 1
+            if self.test_resume_revisions(resumes[0]['id']):
+                tests_passed += 1
+            
+            # Test 8: Search
+            total_tests += 1
+            if self.test_search_resumes(SEARCH_SKILL, SEARCH_EXPECTED_TITLE):
+                tests_passed += 1
+            
+            # Test 9: Job Matching
+            total_tests += 1
+            if self.test_match_resumes():
+                tests_passed += 1
+            
+            # Test 10: Bulk Export
+            total_tests += 1
+            if self.test_export_resumes([resume['id'] for resume in resumes[:2]]):
+                tests_passed += 1
+            
+            # Test 11: Render Job
+            total_tests += 1
+            if self.test_render_job(resumes[0]['id']):
+                tests_passed += 1
+        
+        # Test 12: Bulk Import
+        total_tests += 1
+        if self.test_import_resumes():
+            tests_passed += 1
         
         print("\n" + "=" * 50)
         print(f"🎯 Test Results: {tests_passed}/{total_tests} tests passed")